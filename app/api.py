@@ -1,27 +1,129 @@
-from fastapi import APIRouter
+from typing import Callable, List, Optional
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import json
 from app.models import ChatRequest, ChatResponse
-from app.core.llm import LLMService
-from app.upload_api import UPLOADED_CODEBASES, save_codebases
+from app.core.config import TEMPLATE_FAST_PATH, TEMPLATE_MIN_CONFIDENCE, BATCH_MAX_ITEMS, BATCH_MAX_CONCURRENCY
+from app.core.generator import Generator
+from app.core.intents import IntentParser
+from app.core.lazy import Lazy
+from app.core.ratelimit import PRIORITY_HIGH, PRIORITY_LOW
+from app.core.sessions import session_store
+from app.upload_api import UPLOADED_CODEBASES, codebase_lock, update_codebase_files
 
 
 router = APIRouter(prefix="/api")
 
 
-# Initialize LLM Service
-try:
-    llm_service = LLMService()
-except ValueError as e:
-    print(f"Warning: {e}")
-    llm_service = None
+def _create_llm_service():
+    """LLMService, or None without an API key. Imports the LLM stack (openai) on first call only."""
+    from app.core.llm import LLMService
+    try:
+        service = LLMService()
+    except ValueError as e:
+        print(f"Warning: {e}")
+        return None
+    session_store.summarizer = service.summarize_history
+    return service
+
+
+# Built on first use (or by the app's lifespan warm-up), not at import
+llm = Lazy(_create_llm_service, name="llm")
+
+intent_parser = IntentParser()
+generator = Generator()
 
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
+    # Template answers are instant; LLM calls block while queued for
+    # rate-limit capacity, so they run off the event loop
+    fast = template_response(request)
+    if fast:
+        return _remember(request, fast)
+    return await run_in_threadpool(_llm_chat, request)
+
+
+def template_response(request: ChatRequest) -> Optional[ChatResponse]:
+    """Zero-LLM fast path: plain scaffold/explain requests are served from templates."""
+    if not TEMPLATE_FAST_PATH or request.codebase_id:
+        return None
+    intent = intent_parser.parse(request.message)
+    if intent.confidence < TEMPLATE_MIN_CONFIDENCE or not generator.supports(intent):
+        return None
+    folder_structure, files, explanation = generator.generate(intent)
+    return ChatResponse(
+        folder_structure=folder_structure,
+        files=files,
+        explanation=explanation
+    )
+
+
+@router.post("/chat/batch")
+async def chat_batch(requests: List[ChatRequest]):
+    """
+    Run many chat requests concurrently and stream results as NDJSON in
+    completion order: one {"index", "response"} (or {"index", "error"})
+    line per request. The LLM schedulers enforce rate limits; identical
+    prompts and shared codebase contexts are built/called only once.
+    """
+    if len(requests) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_ITEMS} requests")
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def run(index: int, request: ChatRequest) -> dict:
+        try:
+            fast = template_response(request)
+            if fast:
+                return {"index": index, "response": _remember(request, fast).model_dump()}
+            async with semaphore:
+                result = await run_in_threadpool(_llm_chat, request, priority=PRIORITY_LOW)
+            return {"index": index, "response": result.model_dump()}
+        except Exception as e:
+            print(f"Batch item {index} failed: {e}")
+            return {"index": index, "error": str(e)}
+
+    async def stream():
+        tasks = [asyncio.create_task(run(i, r)) for i, r in enumerate(requests)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def handle_chat(
+    request: ChatRequest,
+    on_queue_position: Optional[Callable[[int], None]] = None,
+    priority: int = PRIORITY_HIGH
+) -> ChatResponse:
+    """Blocking chat handler for background jobs: template fast path, then the LLM."""
+    fast = template_response(request)
+    if fast:
+        return _remember(request, fast)
+    return _llm_chat(request, on_queue_position, priority)
+
+
+def _llm_chat(
+    request: ChatRequest,
+    on_queue_position: Optional[Callable[[int], None]] = None,
+    priority: int = PRIORITY_HIGH
+) -> ChatResponse:
+    """LLM-backed chat; callers have already tried the template fast path."""
+    llm_service = llm.get()
     if not llm_service:
         return ChatResponse(
             explanation="Grok API Key not configured. Please set GROK_API_KEY."
         )
 
+    history = session_store.history(request.session_id) if request.session_id else None
+
     # If a codebase_id is provided, use codebase-aware processing
     if request.codebase_id:
         cb = UPLOADED_CODEBASES.get(request.codebase_id)
@@ -30,24 +132,84 @@ async def chat(request: ChatRequest):
                 explanation=f"Codebase '{request.codebase_id}' not found. Please upload it first."
             )
 
-        result = llm_service.process_with_codebase(request.message, cb["files"])
+        # The LLM works on a snapshot; edits are stored only where the files haven't moved on since
+        with codebase_lock(request.codebase_id):
+            files, version = cb["files"], cb.get("version", 0)
+        result = llm_service.process_with_codebase(
+            request.message,
+            files,
+            context_version=f"{request.codebase_id}:{version}",
+            on_queue_position=on_queue_position,
+            edit_mode=request.edit_mode,
+            sharded=request.sharded,
+            priority=priority,
+            history=history
+        )
 
         # Store the modified files back into the codebase for download
         if result.files:
-            for path, content in result.files.items():
-                cb["files"][path] = {
-                    "content": content,
-                    "size": len(content.encode("utf-8")),
-                    "type": _detect_type(path)
-                }
-
-            cb["status"] = "modified"
-            save_codebases()
+            conflicts = update_codebase_files(request.codebase_id, files, result.files, _detect_type)
+            for path in conflicts:
+                result.changes.append({
+                    "file": path,
+                    "action": "conflict",
+                    "summary": "Changed by another request while this one ran; this edit was not saved."
+                })
 
-        return result
+        return _remember(request, result)
 
     # Standard chat (no codebase context) 
-    return llm_service.process_command(request.message)
+    result = llm_service.process_command(
+        request.message, on_queue_position=on_queue_position, priority=priority, history=history
+    )
+    return _remember(request, result)
+
+
+def _remember(request: ChatRequest, response: ChatResponse) -> ChatResponse:
+    """Record the turn in the request's session (if any) and echo the session id."""
+    if not request.session_id:
+        return response
+    if request.session_id == "new":
+        request.session_id = session_store.new_id()
+    answer = response.explanation
+    if response.files:
+        answer += "\n[Files: " + ", ".join(sorted(response.files)) + "]"
+    session_store.record(request.session_id, request.message, answer)
+    response.session_id = request.session_id
+    return response
+
+
+@router.get("/chat/sessions/{session_id}")
+async def get_session(session_id: str):
+    """Size and running summary of a chat session."""
+    info = session_store.info(session_id)
+    if not info:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return info
+
+
+@router.delete("/chat/sessions/{session_id}")
+async def delete_session(session_id: str):
+    """Forget a chat session's history."""
+    if not session_store.delete(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"success": True}
+
+
+@router.get("/chat/queue")
+async def chat_queue_status():
+    """Current LLM rate-limit queue depth and remaining budget."""
+    llm_service = llm.get()
+    if not llm_service:
+        return {"error": "LLM service not configured"}
+    return {
+        "models": {
+            model: scheduler.status()
+            for model, scheduler in llm_service.schedulers.items()
+        },
+        "coalesced_requests": llm_service.flights.coalesced,
+        "context_cache": llm_service.context_cache.stats()
+    }
 
 
 def _detect_type(filename: str) -> str:
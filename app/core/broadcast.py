@@ -0,0 +1,82 @@
+"""
+Server-Sent Events fan-out.
+
+Publishers (request handlers, possibly on worker threads) hand an event to
+the Broadcaster once; it is serialized to an SSE frame a single time and
+the same bytes are queued for every subscriber.
+
+Each subscriber has a bounded queue. A client that falls behind does not
+block publishers or grow memory: its backlog is dropped and replaced by a
+single `resync` event telling it to refetch over REST.
+
+Fan-out is in-process: with several worker processes, a client only sees
+events published by the worker serving its stream. Run the app with one
+worker while live updates matter.
+"""
+import asyncio
+import json
+import threading
+from typing import Optional, Set
+
+RESYNC_FRAME = "event: resync\ndata: {}\n\n"
+
+
+def sse_frame(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscription:
+    def __init__(self, broadcaster: "Broadcaster", loop: asyncio.AbstractEventLoop, maxsize: int):
+        self._broadcaster = broadcaster
+        self._loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, frame: str):
+        """Enqueue on the subscriber's loop; on overflow collapse the backlog into a resync."""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+
+    async def next(self, timeout: float) -> Optional[str]:
+        """Next frame, or None if nothing arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self._broadcaster._unsubscribe(self)
+
+
+class Broadcaster:
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> Subscription:
+        """Register a subscriber bound to the running event loop."""
+        subscription = Subscription(self, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def publish(self, event: str, data: dict, event_id: Optional[str] = None):
+        """Serialize once and fan out; safe to call from any thread."""
+        frame = sse_frame(event, data, event_id)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription.offer, frame)
+            except RuntimeError:
+                # Loop already closed — the client is gone
+                self._unsubscribe(subscription)
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
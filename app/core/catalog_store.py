@@ -0,0 +1,338 @@
+"""
+Catalog Storage Backends.
+
+Projects and repositories sit behind a small store interface so the
+dashboard can run from process memory (the default, seeded with the sample
+data) or from an embedded SQLite file that survives restarts and is shared
+by every worker process:
+
+  - MemoryCatalogStore: hash maps and a trigram index over Python lists
+  - SQLiteCatalogStore: indexed tables plus an FTS5 trigram index for
+    repository search; only matching rows are decoded per query
+
+Both support bulk import (replacing the catalog in one step) and export.
+`version()` changes on every import — in SQLite it is stored in the file,
+so cached responses are invalidated in all workers, not just the one that
+imported.
+"""
+import json
+import sqlite3
+import threading
+from typing import Hashable, List, Optional
+
+SEARCH_FIELDS = ("name", "language", "description", "framework")
+NGRAM = 3
+KINDS = ("projects", "repositories")
+
+
+def _ngrams(text: str) -> set:
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _search_fields(repo: dict) -> tuple:
+    return tuple(str(repo.get(f, "")).lower() for f in SEARCH_FIELDS)
+
+
+def _record_fields(records: List[dict]) -> tuple:
+    """Every key used by `records`, in first-seen order."""
+    return tuple(dict.fromkeys(k for r in records for k in r))
+
+
+def validate_catalog(projects: List[dict], repositories: List[dict]):
+    """Raise ValueError unless every record has the keys the stores index on."""
+    for p in projects:
+        if not p.get("id") or "status" not in p:
+            raise ValueError(f"Project is missing 'id' or 'status': {str(p)[:80]}")
+    for r in repositories:
+        if not r.get("name"):
+            raise ValueError(f"Repository is missing 'name': {str(r)[:80]}")
+
+
+class CatalogStore:
+    """Interface shared by the catalog backends. Returned records must be treated as read-only."""
+
+    backend = ""
+
+    def version(self) -> Hashable:
+        """Changes whenever the catalog changes; keys cached responses."""
+        raise NotImplementedError
+
+    def projects(self, status: str = "") -> List[dict]:
+        raise NotImplementedError
+
+    def search_repositories(self, query: str = "") -> List[dict]:
+        """Repositories whose name, language, description or framework contains `query` (case-insensitive)."""
+        raise NotImplementedError
+
+    def repository(self, name: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def fields(self, kind: str) -> tuple:
+        """Known record fields of `kind` ("projects" or "repositories")."""
+        raise NotImplementedError
+
+    def count(self, kind: str) -> int:
+        """Number of records of `kind` ("projects" or "repositories")."""
+        raise NotImplementedError
+
+    def project(self, kind: str, records: List[dict], fields: tuple) -> List[dict]:
+        """`records` reduced to `fields` (missing fields are omitted)."""
+        return [{f: r[f] for f in fields if f in r} for r in records]
+
+    def import_records(self, projects: List[dict], repositories: List[dict]):
+        """Replace the whole catalog."""
+        raise NotImplementedError
+
+    def export(self) -> dict:
+        return {"projects": self.projects(), "repositories": self.search_repositories()}
+
+
+# ─── In-Memory ──────────────────────────────────────────────────
+_MISSING = object()
+
+
+class Columns:
+    """Column-wise copy of a record list, for cheap field projections."""
+
+    def __init__(self, records: list):
+        self.fields = _record_fields(records)
+        self.columns = {f: [r.get(f, _MISSING) for r in records] for f in self.fields}
+        self.position = {id(r): i for i, r in enumerate(records)}
+
+    def project(self, records: list, fields: tuple) -> list:
+        """`records` (items of the indexed list) reduced to `fields`."""
+        columns = [(f, self.columns[f]) for f in fields]
+        rows = []
+        for record in records:
+            i = self.position[id(record)]
+            rows.append({f: col[i] for f, col in columns if col[i] is not _MISSING})
+        return rows
+
+
+class MemoryCatalogStore(CatalogStore):
+    """Catalog held in process memory and indexed on import; lost on restart."""
+
+    backend = "memory"
+
+    def __init__(self, projects: List[dict] = (), repositories: List[dict] = ()):
+        self._version = 0
+        self.import_records(list(projects), list(repositories))
+
+    def import_records(self, projects: List[dict], repositories: List[dict]):
+        validate_catalog(projects, repositories)
+        # Indexes are built aside and swapped in at the end, so a record that
+        # fails mid-build leaves the current catalog untouched
+        repo_by_name = {r["name"]: r for r in repositories}
+
+        projects_by_status = {}
+        for p in projects:
+            projects_by_status.setdefault(p["status"], []).append(p)
+
+        # Lower-cased search fields per repo, and trigram -> repo positions
+        search_fields = [_search_fields(r) for r in repositories]
+        trigrams = {}
+        for position, fields in enumerate(search_fields):
+            for field in fields:
+                for gram in _ngrams(field):
+                    trigrams.setdefault(gram, set()).add(position)
+
+        columns = {"projects": Columns(projects), "repositories": Columns(repositories)}
+
+        self._projects, self._repositories = projects, repositories
+        self.repo_by_name, self.projects_by_status = repo_by_name, projects_by_status
+        self.search_fields, self.trigrams, self.columns = search_fields, trigrams, columns
+        self._version += 1
+
+    def version(self) -> Hashable:
+        return self._version
+
+    def projects(self, status: str = "") -> List[dict]:
+        if not status:
+            return self._projects
+        return self.projects_by_status.get(status.lower(), [])
+
+    def search_repositories(self, query: str = "") -> List[dict]:
+        if not query:
+            return self._repositories
+        q = query.lower()
+        if len(q) < NGRAM:
+            candidates = range(len(self._repositories))
+        else:
+            postings = [self.trigrams.get(gram, set()) for gram in _ngrams(q)]
+            candidates = sorted(set.intersection(*postings)) if postings else []
+        return [
+            self._repositories[i] for i in candidates
+            if any(q in field for field in self.search_fields[i])
+        ]
+
+    def repository(self, name: str) -> Optional[dict]:
+        return self.repo_by_name.get(name)
+
+    def fields(self, kind: str) -> tuple:
+        return self.columns[kind].fields
+
+    def count(self, kind: str) -> int:
+        return len(self._projects if kind == "projects" else self._repositories)
+
+    def project(self, kind: str, records: List[dict], fields: tuple) -> List[dict]:
+        return self.columns[kind].project(records, fields)
+
+
+# ─── SQLite ─────────────────────────────────────────────────────
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    seq      INTEGER PRIMARY KEY,
+    id       TEXT NOT NULL UNIQUE,
+    status   TEXT NOT NULL,
+    payload  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status, seq);
+CREATE TABLE IF NOT EXISTS repositories (
+    seq      INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    search   TEXT NOT NULL,
+    payload  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Trigram FTS over the search fields; rowid = repositories.seq
+_FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS repo_search
+USING fts5({", ".join(SEARCH_FIELDS)}, tokenize='trigram')
+"""
+
+IMPORT_BATCH = 5000      # Rows per executemany during bulk import
+
+
+class SQLiteCatalogStore(CatalogStore):
+    """Catalog in an SQLite file (WAL mode), shared by all processes that open it."""
+
+    backend = "sqlite"
+
+    def __init__(self, path: str, seed_projects: List[dict] = (), seed_repositories: List[dict] = ()):
+        """
+        Args:
+            path: SQLite file (":memory:" for a throwaway store).
+            seed_projects, seed_repositories: Loaded when the store is empty.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            # SQLite < 3.34 has no trigram tokenizer; search scans the `search` column instead
+            self._fts = False
+        self._fields_cache = (None, {})
+        if not self._meta("version") and (seed_projects or seed_repositories):
+            self.import_records(list(seed_projects), list(seed_repositories))
+
+    def version(self) -> Hashable:
+        return int(self._meta("version") or 0)
+
+    def projects(self, status: str = "") -> List[dict]:
+        if not status:
+            return self._payloads("SELECT payload FROM projects ORDER BY seq")
+        return self._payloads(
+            "SELECT payload FROM projects WHERE status = ? ORDER BY seq", (status.lower(),)
+        )
+
+    def search_repositories(self, query: str = "") -> List[dict]:
+        if not query:
+            return self._payloads("SELECT payload FROM repositories ORDER BY seq")
+        q = query.lower()
+        if self._fts and len(q) >= NGRAM:
+            rows = self._payloads(
+                "SELECT r.payload FROM repo_search JOIN repositories r ON r.seq = repo_search.rowid "
+                "WHERE repo_search MATCH ? ORDER BY r.seq",
+                ('"' + q.replace('"', '""') + '"',)
+            )
+        else:
+            rows = self._payloads(
+                "SELECT payload FROM repositories WHERE instr(search, ?) > 0 ORDER BY seq", (q,)
+            )
+        # FTS can match across a field boundary; keep the in-memory store's exact semantics
+        return [r for r in rows if any(q in field for field in _search_fields(r))]
+
+    def repository(self, name: str) -> Optional[dict]:
+        rows = self._payloads("SELECT payload FROM repositories WHERE name = ?", (name,))
+        return rows[0] if rows else None
+
+    def fields(self, kind: str) -> tuple:
+        version, fields = self._fields_cache
+        current = self.version()
+        if version != current:
+            fields = {k: tuple(json.loads(self._meta(f"fields:{k}") or "[]")) for k in KINDS}
+            self._fields_cache = (current, fields)
+        return fields[kind]
+
+    def count(self, kind: str) -> int:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown record kind: {kind!r}")
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {kind}").fetchone()[0]
+
+    def import_records(self, projects: List[dict], repositories: List[dict]):
+        validate_catalog(projects, repositories)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM projects")
+            self._conn.execute("DELETE FROM repositories")
+            if self._fts:
+                self._conn.execute("DELETE FROM repo_search")
+            for start in range(0, len(projects), IMPORT_BATCH):
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO projects (id, status, payload) VALUES (?, ?, ?)",
+                    [(p["id"], p["status"], json.dumps(p)) for p in projects[start:start + IMPORT_BATCH]]
+                )
+            for start in range(0, len(repositories), IMPORT_BATCH):
+                rows = [
+                    (seq, r["name"], _search_fields(r), json.dumps(r))
+                    for seq, r in enumerate(repositories[start:start + IMPORT_BATCH], start + 1)
+                ]
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO repositories (seq, name, search, payload) VALUES (?, ?, ?, ?)",
+                    [(seq, name, "\x1f".join(fields), payload) for seq, name, fields, payload in rows]
+                )
+                if self._fts:
+                    self._conn.executemany(
+                        f"INSERT INTO repo_search (rowid, {', '.join(SEARCH_FIELDS)}) "
+                        f"VALUES (?{', ?' * len(SEARCH_FIELDS)})",
+                        [(seq, *fields) for seq, _, fields, _ in rows]
+                    )
+            meta = {
+                "fields:projects": json.dumps(_record_fields(projects)),
+                "fields:repositories": json.dumps(_record_fields(repositories)),
+            }
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)", meta.items()
+            )
+            self._conn.execute(
+                "INSERT INTO catalog_meta (key, value) VALUES ('version', '1') "
+                "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+
+    def _payloads(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM catalog_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+
+def open_store(backend: str, path: str, projects: List[dict] = (), repositories: List[dict] = ()) -> CatalogStore:
+    """Store for IDP_DATA_BACKEND ("memory" or "sqlite"), seeded with the given records when empty."""
+    if backend == "memory":
+        return MemoryCatalogStore(projects, repositories)
+    if backend == "sqlite":
+        return SQLiteCatalogStore(path, projects, repositories)
+    raise ValueError(f"Unknown data backend: {backend!r} (expected 'memory' or 'sqlite')")
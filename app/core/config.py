@@ -1,8 +1,77 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+def _load_env_file():
+    """Load the nearest .env above this package (as python-dotenv would); dotenv is imported only if one exists."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
+
+_load_env_file()
 
 GROK_API_KEY = os.getenv("GROK_API_KEY")
-GROK_BASE_URL = "https://api.groq.com/openai/v1"  # Switched to Groq based on key
+# Switched to Groq based on key; point at benchmarks/fake_llm.py for load tests
+GROK_BASE_URL = os.getenv("GROK_BASE_URL", "https://api.groq.com/openai/v1")
+
+# ─── LLM Rate Limiting (client-side scheduler) ─────────────────
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "12000"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_MAX_QUEUE_WAIT = float(os.getenv("LLM_MAX_QUEUE_WAIT", "120"))
+
+# ─── Codebase Edits ────────────────────────────────────────────
+CODEBASE_EDIT_MODE = os.getenv("CODEBASE_EDIT_MODE", "patch")  # "patch" or "full"
+
+# ─── Template Fast Path ─────────────────────────────────────────
+TEMPLATE_FAST_PATH = os.getenv("TEMPLATE_FAST_PATH", "true").lower() == "true"
+TEMPLATE_MIN_CONFIDENCE = float(os.getenv("TEMPLATE_MIN_CONFIDENCE", "0.8"))
+
+# ─── Model Routing ─────────────────────────────────────────────
+LLM_ROUTING = os.getenv("LLM_ROUTING", "true").lower() == "true"
+ROUTE_MODELS = {
+    "fast": os.getenv("LLM_FAST_MODEL", "llama-3.1-8b-instant"),
+    "large": os.getenv("LLM_LARGE_MODEL", "llama-3.3-70b-versatile"),
+}
+ROUTE_FAST_MAX_CONTEXT_CHARS = int(os.getenv("ROUTE_FAST_MAX_CONTEXT_CHARS", "8000"))
+ROUTE_FAST_MAX_MESSAGE_CHARS = int(os.getenv("ROUTE_FAST_MAX_MESSAGE_CHARS", "400"))
+
+# ─── Background Jobs ───────────────────────────────────────────
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_QUEUE = int(os.getenv("JOB_MAX_QUEUE", "100"))
+JOB_HISTORY_LIMIT = int(os.getenv("JOB_HISTORY_LIMIT", "500"))
+JOBS_PERSISTENCE_FILE = os.getenv("JOBS_PERSISTENCE_FILE", "jobs.json")
+
+# ─── Batch Chat ────────────────────────────────────────────────
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "16"))
+
+# ─── Upload Ingestion ──────────────────────────────────────────
+INGEST_FILTER = os.getenv("INGEST_FILTER", "true").lower() == "true"
+
+# ─── Dashboard Data ────────────────────────────────────────────
+DATA_BACKEND = os.getenv("IDP_DATA_BACKEND", "memory")   # "memory" or "sqlite"
+DATA_FILE = os.getenv("IDP_DATA_FILE", "catalog.db")       # SQLite backend only
+
+# ─── Activity Event Log ────────────────────────────────────────
+EVENT_LOG_FILE = os.getenv("EVENT_LOG_FILE", "events.db")
+EVENT_LOG_MAX_EVENTS = int(os.getenv("EVENT_LOG_MAX_EVENTS", "1000000"))
+ACTIVITY_STREAM_QUEUE = int(os.getenv("ACTIVITY_STREAM_QUEUE", "100"))  # Per-client SSE backlog
+
+# ─── Response Caching ──────────────────────────────────────────
+# Cache-Control for pre-serialized catalog responses (projects, repos); stats always revalidate
+CATALOG_CACHE_CONTROL = os.getenv("CATALOG_CACHE_CONTROL", "public, max-age=60")
 
+# ─── Compression & Static Assets ───────────────────────────────
+GZIP_MINIMUM_SIZE = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))  # Smaller responses are sent as-is
+# Serve frontend/ fingerprinted + precompressed (false = plain StaticFiles, picks up edits live)
+STATIC_ASSET_BUNDLE = os.getenv("STATIC_ASSET_BUNDLE", "true").lower() == "true"
@@ -0,0 +1,55 @@
+"""
+Context Assembly Cache.
+
+Bounded, thread-safe LRU used to reuse expensive prompt fragments across
+chat turns — the manifest tree per codebase version and the selected
+files' blocks per (codebase version, selected file set). Query-dependent
+parts (manifest focus, summaries) are not cached.
+
+Concurrent misses on the same key are coalesced, so a burst of requests
+against one codebase (e.g. a batch) builds each fragment only once.
+Codebase prompts are laid out most-stable first (instructions, manifest,
+selected files, then the request), so cached fragments also line up with
+the provider's prompt caching.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from app.core.singleflight import SingleFlight
+
+
+class LRUCache:
+    """Least-recently-used cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._builds = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable):
+        """Return the cached value for `key`, building and storing it on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        value, _ = self._builds.do(repr(key), lambda: self._store(key, build()))
+        return value
+
+    def _store(self, key: Hashable, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._data), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,312 @@
+"""
+Append-only Activity Event Log.
+
+Activity events live in SQLite instead of a Python list, so the feed can
+grow without growing process memory and every query is served by an index
+with a LIMIT:
+
+  - (type, timestamp, seq) and (timestamp, seq) indexes back type filters,
+    since/until ranges and the feed order
+  - pagination is keyset-based: the cursor is the (timestamp, sequence
+    number) of the last event returned, so deep pages cost the same as the
+    first one
+  - retention keeps at most `max_events` rows, trimming the oldest
+
+Hourly and daily per-type counters and state gauges (open incidents,
+pending reviews) are materialized in the same transaction as each append,
+so dashboard stats and time series never scan the log — and survive
+retention trimming. Gauges count items, not events: incident and review
+events name the item they update in `item_id` (events without one are an
+item of their own), each item's latest status is tracked in `item_state`,
+and a gauge moves only when an item opens or closes.
+
+The SQLite file (WAL mode) can be opened by several worker processes, and
+version() reads the database, so caches keyed on it see every worker's
+appends. Retention is per process, though: each EventLog counts only its
+own appends against `max_events`, so with N writer processes the log can
+grow to about N × max_events between trims. Run one writer process if
+the cap must be exact.
+
+Events are returned newest first by timestamp, ties broken by insertion
+order, so backfilled events land where they belong. Timestamps are ISO 8601
+in UTC, stored without an offset: timezone-aware ones are converted on the
+way in, naive ones are taken to already be UTC, and missing ones default to
+the current UTC time. Rollup buckets are therefore UTC hours and days.
+"""
+import json
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    id         TEXT NOT NULL UNIQUE,
+    type       TEXT NOT NULL,
+    timestamp  TEXT NOT NULL,
+    payload    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_type_time ON events (type, timestamp, seq);
+CREATE INDEX IF NOT EXISTS idx_events_time ON events (timestamp, seq);
+CREATE TABLE IF NOT EXISTS rollups (
+    granularity TEXT NOT NULL,
+    bucket      TEXT NOT NULL,
+    type        TEXT NOT NULL,
+    count       INTEGER NOT NULL,
+    PRIMARY KEY (granularity, type, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS gauges (
+    name  TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS item_state (
+    type       TEXT NOT NULL,
+    item       TEXT NOT NULL,
+    is_open    INTEGER NOT NULL,
+    timestamp  TEXT NOT NULL,
+    PRIMARY KEY (type, item)
+) WITHOUT ROWID;
+"""
+# Rollup bucket = ISO timestamp prefix
+GRANULARITIES = {"hour": 13, "day": 10}
+RESOLVED_STATUSES = {"resolved", "closed", "mitigated"}
+REVIEW_OPEN_STATUSES = {"", "pending", "in_review"}
+# Event type → gauge counting that type's open items
+GAUGES = {"incident": "open_incidents", "code_review": "code_reviews_pending"}
+
+TRIM_BATCH = 1000    # Rows deleted at a time when over retention
+
+
+class EventLog:
+    def __init__(self, path: str, max_events: int = 1_000_000, seed: Iterable[dict] = ()):
+        """
+        Args:
+            path: SQLite file (":memory:" for a throwaway log).
+            max_events: Retention cap; the oldest events beyond it are deleted.
+            seed: Events (newest first) loaded when the log is empty.
+        """
+        self.max_events = max_events
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._count = self.count()
+        if not self._count:
+            self.append_many(reversed(list(seed)))
+
+    def append(self, event: dict) -> Optional[dict]:
+        """Store one event; returns it (with id/timestamp filled in) or None if its id exists."""
+        stored, _ = self.append_many([event])
+        return stored[0] if stored else None
+
+    def append_many(self, events: Iterable[dict]) -> Tuple[List[dict], int]:
+        """Store events in order (oldest first). Returns (stored events, duplicate count)."""
+        stored, duplicates = [], 0
+        with self._lock, self._conn:
+            for event in events:
+                event = dict(event)
+                event["id"] = event.get("id") or f"evt-{uuid.uuid4().hex[:12]}"
+                event["type"] = event["type"].lower()
+                event["timestamp"] = normalize_timestamp(
+                    event.get("timestamp") or utc_now().isoformat(timespec="seconds")
+                )
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO events (id, type, timestamp, payload) VALUES (?, ?, ?, ?)",
+                    (event["id"], event["type"], event["timestamp"], json.dumps(event))
+                )
+                if not cursor.rowcount:
+                    duplicates += 1
+                    continue
+                self._roll_up(event)
+                stored.append(event)
+            self._count += len(stored)
+            if self._count > self.max_events:
+                self._trim()
+        return stored, duplicates
+
+    def page(
+        self,
+        event_type: str = "",
+        since: str = "",
+        until: str = "",
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Tuple[List[dict], Optional[str]]:
+        """
+        Newest-first events matching the filters (since inclusive, until
+        exclusive, ISO timestamps). Returns (events, next_cursor); the
+        cursor is None on the last page. Raises ValueError for a malformed
+        timestamp or cursor.
+        """
+        clauses, params = [], []
+        if event_type:
+            clauses.append("type = ?")
+            params.append(event_type.lower())
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(normalize_timestamp(since))
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(normalize_timestamp(until))
+        if cursor:
+            clauses.append("(timestamp, seq) < (?, ?)")
+            params.extend(_decode_cursor(cursor))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT seq, timestamp, payload FROM events {where} ORDER BY timestamp DESC, seq DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = f"{last['timestamp']}~{last['seq']}"
+        return [json.loads(row["payload"]) for row in rows[:limit]], next_cursor
+
+    def version(self) -> int:
+        """Last sequence number written by any process; changes on every append."""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+
+    def last_id(self) -> Optional[str]:
+        """Id of the most recently appended event."""
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM events ORDER BY seq DESC LIMIT 1").fetchone()
+        return row["id"] if row else None
+
+    def appended_after(self, event_id: str, limit: int) -> Optional[List[dict]]:
+        """
+        Events appended after `event_id`, in append order — what a stream
+        client that last saw `event_id` missed. None if the id is unknown
+        (e.g. trimmed) or more than `limit` events were missed.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT seq FROM events WHERE id = ?", (event_id,)).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT payload FROM events WHERE seq > ? ORDER BY seq LIMIT ?", (row["seq"], limit + 1)
+            ).fetchall()
+        if len(rows) > limit:
+            return None
+        return [json.loads(row["payload"]) for row in rows]
+
+    def count(self, event_type: str = "") -> int:
+        with self._lock:
+            if event_type:
+                return self._conn.execute(
+                    "SELECT COUNT(*) FROM events WHERE type = ?", (event_type.lower(),)
+                ).fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    # ─── Rollups ────────────────────────────────────────────────
+    def bucket_count(self, event_type: str, granularity: str, bucket: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT count FROM rollups WHERE granularity = ? AND type = ? AND bucket = ?",
+                (granularity, event_type.lower(), bucket)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def series(self, event_type: str, granularity: str = "day", since: str = "", until: str = "") -> dict:
+        """{bucket: count} for one event type; buckets in [since, until) by prefix."""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity!r}")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, count FROM rollups WHERE granularity = ? AND type = ? "
+                "AND bucket >= ? AND (? = '' OR bucket < ?) ORDER BY bucket",
+                (granularity, event_type.lower(), since, until, until)
+            ).fetchall()
+        return {row["bucket"]: row["count"] for row in rows}
+
+    def gauges(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT name, value FROM gauges").fetchall()
+        return {row["name"]: row["value"] for row in rows}
+
+    def _roll_up(self, event: dict):
+        """Update counters for one new event (caller holds the lock, inside the transaction)."""
+        for granularity, width in GRANULARITIES.items():
+            self._conn.execute(
+                "INSERT INTO rollups (granularity, bucket, type, count) VALUES (?, ?, ?, 1) "
+                "ON CONFLICT (granularity, type, bucket) DO UPDATE SET count = count + 1",
+                (granularity, event["timestamp"][:width], event["type"])
+            )
+        self._track_item(event)
+
+    def _track_item(self, event: dict):
+        """Record the item's status if `event` is its latest, moving the gauge when it opens or closes."""
+        gauge = GAUGES.get(event["type"])
+        if gauge is None:
+            return
+        is_open = int(is_open_status(event["type"], event.get("status", "")))
+        item = event.get("item_id") or event["id"]
+        row = self._conn.execute(
+            "SELECT is_open, timestamp FROM item_state WHERE type = ? AND item = ?", (event["type"], item)
+        ).fetchone()
+        if row is not None and row["timestamp"] > event["timestamp"]:
+            return  # A backfilled event older than the item's current status
+        self._conn.execute(
+            "INSERT OR REPLACE INTO item_state (type, item, is_open, timestamp) VALUES (?, ?, ?, ?)",
+            (event["type"], item, is_open, event["timestamp"])
+        )
+        change = is_open - (row["is_open"] if row is not None else 0)
+        if change:
+            self._conn.execute(
+                "INSERT INTO gauges (name, value) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value",
+                (gauge, change)
+            )
+
+    def _trim(self):
+        """Delete the oldest rows beyond max_events (caller holds the lock)."""
+        excess = self._count - self.max_events
+        while excess > 0:
+            batch = min(excess, TRIM_BATCH)
+            self._conn.execute(
+                "DELETE FROM events WHERE seq IN (SELECT seq FROM events ORDER BY timestamp, seq LIMIT ?)",
+                (batch,)
+            )
+            excess -= batch
+        self._count = min(self._count, self.max_events)
+
+
+def is_open_status(event_type: str, status: str) -> bool:
+    """Whether an incident / code review with this status still counts as open."""
+    if event_type == "code_review":
+        return status in REVIEW_OPEN_STATUSES
+    return status not in RESOLVED_STATUSES
+
+
+def utc_now() -> datetime:
+    """Current time as a naive UTC datetime, the form timestamps are stored in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def normalize_timestamp(value: str) -> str:
+    """
+    Canonical ISO 8601 form of `value` in UTC (naive input is taken as UTC),
+    so timestamps compare as strings; ValueError if malformed.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid ISO 8601 timestamp: {value!r}")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.isoformat()
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    timestamp, _, seq = cursor.rpartition("~")
+    try:
+        return normalize_timestamp(timestamp), int(seq)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
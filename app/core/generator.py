@@ -1,38 +1,33 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 from app.core.intents import Intent
-from app.core.templates import TEMPLATES
+from app.core.templates import TEMPLATES, STACK_INFO
 
 class Generator:
+    def supports(self, intent: Intent) -> bool:
+        """True when a template can fully answer the intent without the LLM."""
+        return intent.action == "explain" or intent.tech_stack in TEMPLATES
+
     def generate(self, intent: Intent) -> Tuple[str, Dict[str, str], str]:
         if intent.action == "explain":
              return self._explain_architecture()
-        
-        if intent.tech_stack == "node":
-            return self._generate_node_service()
-        elif intent.tech_stack == "python":
-            return self._generate_python_service()
+
+        if intent.tech_stack in TEMPLATES:
+            return self._generate_service(intent)
         else:
             # Default to text response if unknown stack for creation
-            return "", {}, "I can help you create a Node.js or Python service. Try 'Create a Node.js service'."
-
-    def _generate_node_service(self) -> Tuple[str, Dict[str, str], str]:
-        folder_structure = """
-my-service/
-├── package.json
-└── index.js
-"""
-        files = TEMPLATES["node"]
-        explanation = "Created a basic Node.js Express service logic."
-        return folder_structure, files, explanation
+            return "", {}, "I can help you create a Node.js, Python, Go or Java service. Try 'Create a Node.js service'."
 
-    def _generate_python_service(self) -> Tuple[str, Dict[str, str], str]:
-        folder_structure = """
-my-service/
-├── requirements.txt
-└── main.py
-"""
-        files = TEMPLATES["python"]
-        explanation = "Created a basic Python FastAPI service logic."
+    def _generate_service(self, intent: Intent) -> Tuple[str, Dict[str, str], str]:
+        info = STACK_INFO[intent.tech_stack]
+        name = intent.service_name or "my-service"
+        params = {"service_name": name, "port": intent.port or info["port"]}
+
+        files = {
+            path: template.substitute(params)
+            for path, template in TEMPLATES[intent.tech_stack].items()
+        }
+        folder_structure = _render_tree(name, sorted(files))
+        explanation = f"Created a basic {info['label']} named '{name}'."
         return folder_structure, files, explanation
 
     def _explain_architecture(self) -> Tuple[str, Dict[str, str], str]:
@@ -43,3 +38,25 @@ IDP Architecture:
 3. **Infrastructure**: Kubernetes clusters for deploying generated services.
         """
         return "", {}, explanation
+
+
+def _render_tree(root: str, paths: List[str]) -> str:
+    """ASCII tree for a small, sorted list of template paths."""
+    tree: dict = {}
+    for path in paths:
+        node = tree
+        for part in path.split("/"):
+            node = node.setdefault(part, {})
+
+    lines = [f"{root}/"]
+
+    def walk(node: dict, prefix: str):
+        items = list(node.items())
+        for i, (name, children) in enumerate(items):
+            last = i == len(items) - 1
+            lines.append(prefix + ("└── " if last else "├── ") + name + ("/" if children else ""))
+            if children:
+                walk(children, prefix + ("    " if last else "│   "))
+
+    walk(tree, "")
+    return "\n" + "\n".join(lines) + "\n"
@@ -0,0 +1,248 @@
+"""
+Ingest-time File Classification.
+
+Decides, while a codebase is being uploaded, which files are worth storing.
+Vendored dependencies, build output, lockfiles, minified bundles and
+generated code bloat memory, codebases.json, indexes and the LLM manifest
+without helping the model, so they are recorded as metadata only.
+
+Checks run cheapest first:
+  1. Path rules — .gitignore patterns, vendored/build directories,
+     lockfiles and generated-file name patterns (no content read needed)
+  2. Content heuristics — a standard generated-code header as the first
+     comment line, very long lines in JS/CSS (minified bundles) and high
+     character entropy (encoded blobs)
+
+Generic build directory names (build, out, target, ...) are also common
+source package names, so they count as build output only directly under a
+project root — the upload root or a directory holding a project manifest —
+unless a .gitignore says otherwise.
+"""
+import fnmatch
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+VENDORED_DIRS = {
+    "node_modules", "bower_components", "jspm_packages", "vendor", "third_party",
+    ".venv", "venv", "site-packages", "__pycache__", ".git", ".svn", ".hg",
+    ".idea", ".vscode", ".pytest_cache", ".mypy_cache", ".tox", ".gradle", "Pods",
+}
+BUILD_DIRS = {".next", ".nuxt", ".output", ".cache"}                           # At any depth
+ROOT_BUILD_DIRS = {"dist", "build", "out", "target", "coverage", "obj", "bin"}  # Only under a project root
+PROJECT_MANIFESTS = {
+    "package.json", "pyproject.toml", "setup.py", "pom.xml", "build.gradle", "build.gradle.kts",
+    "cargo.toml", "go.mod", "composer.json", "gemfile", "makefile", "cmakelists.txt",
+}
+LOCKFILES = {
+    "package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "pipfile.lock",
+    "cargo.lock", "composer.lock", "gemfile.lock", "go.sum", "npm-shrinkwrap.json", "bun.lockb",
+}
+GENERATED_NAME_PATTERNS = [
+    "*.min.js", "*.min.css", "*.map", "*.bundle.js", "*.chunk.js", "*.pb.go", "*_pb2.py",
+    "*_pb2_grpc.py", "*.generated.*", "*.g.dart", "*.designer.cs",
+]
+# Standard generated-file headers, matched against the first comment line only
+_GENERATED_HEADER = re.compile(
+    r"^(?:code generated .*do not edit|@generated\b|"
+    r"this (?:file|code) (?:was|is|has been) (?:automatically |auto-?)generated)",
+    re.I
+)
+_COMMENT_PREFIX = re.compile(r"^(?:#+|//+|/\*+|\*+|--|<!--|;+|%+|\"\"\"|''')\s*")
+_CODING_LINE = re.compile(r"^#!|^#.*coding[:=]")
+HEADER_SCAN_LINES = 5            # Lines searched for the first comment
+
+# Line-length checks apply only to bundle formats; one-line JSON/config files are legitimate
+MINIFIED_EXTENSIONS = {".js", ".mjs", ".cjs", ".css"}
+MINIFIED_AVG_LINE = 300          # Average line length that signals minified code
+MINIFIED_MAX_LINE = 2000         # Any single line this long (with few lines) is suspect
+ENTROPY_THRESHOLD = 5.2          # bits/char — base64 / encoded blobs sit near 6
+ENTROPY_MIN_SIZE = 4096          # Only entropy-check files at least this large
+ENTROPY_MIN_AVG_LINE = 80        # ...whose lines are also longer than typical source
+SNIFF_CHARS = 8192               # Content prefix inspected by the heuristics
+
+
+class _GitignoreRule:
+    __slots__ = ("base", "regex", "negate", "dir_only")
+
+    def __init__(self, base: str, pattern: str):
+        self.base = base
+        self.negate = pattern.startswith("!")
+        if self.negate:
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.strip("/") if self.dir_only else pattern
+        anchored = "/" in pattern.rstrip("/")
+        pattern = pattern.lstrip("/")
+        body = _glob_to_regex(pattern)
+        self.regex = re.compile(("" if anchored else r"(?:.*/)?") + body + r"\Z")
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return bool(self.regex.match(rel_path))
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append(r"(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i):
+            out.append(r"/.*")
+            i += 3
+        elif pattern[i] == "*":
+            out.append(r"[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append(r"[^/]")
+            i += 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class IngestFilter:
+    def __init__(self):
+        self._rules: List[_GitignoreRule] = []
+        self._roots = {""}
+
+    def add_project_roots(self, paths: List[str]):
+        """
+        Register project roots found among the uploaded `paths`: a single
+        top-level folder wrapping the whole upload, and every directory
+        holding a project manifest.
+        """
+        norms = [p.replace("\\", "/") for p in paths]
+        tops = {n.split("/")[0] for n in norms}
+        if len(tops) == 1 and all("/" in n for n in norms):
+            self._roots |= tops
+        for norm in norms:
+            if os.path.basename(norm).lower() in PROJECT_MANIFESTS:
+                self._roots.add(os.path.dirname(norm))
+
+    def add_gitignore(self, path: str, text: str):
+        """Register the patterns of a .gitignore located at `path`."""
+        base = os.path.dirname(path.replace("\\", "/"))
+        for line in text.splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                self._rules.append(_GitignoreRule(base, line))
+
+    def classify_path(self, path: str) -> Optional[str]:
+        """Reason to skip based on the path alone, or None to keep."""
+        norm = path.replace("\\", "/")
+        parts = norm.split("/")
+        name = parts[-1].lower()
+
+        for depth, directory in enumerate(parts[:-1]):
+            if directory in VENDORED_DIRS:
+                return "vendored"
+            if directory in BUILD_DIRS:
+                return "build_output"
+            if directory in ROOT_BUILD_DIRS and "/".join(parts[:depth]) in self._roots:
+                return "build_output"
+        if name in LOCKFILES:
+            return "lockfile"
+        if any(fnmatch.fnmatch(name, p) for p in GENERATED_NAME_PATTERNS):
+            return "generated"
+        if self._gitignored(norm, parts):
+            return "gitignored"
+        return None
+
+    def classify_content(self, path: str, text: str) -> Optional[str]:
+        """Reason to skip based on content heuristics, or None to keep."""
+        sample = text[:SNIFF_CHARS]
+        header = _first_comment(sample)
+        if header and _GENERATED_HEADER.match(header):
+            return "generated"
+
+        lines = sample.split("\n")
+        avg_line = len(sample) / len(lines)
+        if os.path.splitext(path)[1].lower() in MINIFIED_EXTENSIONS:
+            longest = max(len(l) for l in lines)
+            if avg_line > MINIFIED_AVG_LINE or (longest > MINIFIED_MAX_LINE and len(lines) < 20):
+                return "minified"
+        if len(text) >= ENTROPY_MIN_SIZE and avg_line > ENTROPY_MIN_AVG_LINE and _entropy(sample) > ENTROPY_THRESHOLD:
+            return "minified"
+        return None
+
+    def _gitignored(self, norm: str, parts: List[str]) -> bool:
+        if not self._rules:
+            return False
+        ignored = False
+        for rule in self._rules:
+            if rule.base and not norm.startswith(rule.base + "/"):
+                continue
+            rel_parts = parts[len(rule.base.split("/")):] if rule.base else parts
+            # A rule matches the file itself or any of its parent directories
+            for depth in range(1, len(rel_parts) + 1):
+                if rule.matches("/".join(rel_parts[:depth]), is_dir=depth < len(rel_parts)):
+                    ignored = not rule.negate
+                    break
+        return ignored
+
+
+def _first_comment(sample: str) -> Optional[str]:
+    """Text of the first comment line (after a shebang / coding line), or None if code comes first."""
+    for line in sample.split("\n", HEADER_SCAN_LINES)[:HEADER_SCAN_LINES]:
+        line = line.strip()
+        if not line or _CODING_LINE.search(line):
+            continue
+        prefix = _COMMENT_PREFIX.match(line)
+        if not prefix:
+            return None
+        comment = line[prefix.end():].strip()
+        if comment:
+            return comment
+    return None
+
+
+def _entropy(text: str) -> float:
+    counts = Counter(text)
+    total = len(text)
+    return -sum((n / total) * math.log2(n / total) for n in counts.values())
+
+
+class IngestReport:
+    """Accumulates what was skipped during one upload."""
+
+    MAX_LISTED = 5000  # Skipped paths kept as metadata per codebase
+
+    def __init__(self):
+        self.by_reason: Dict[str, Dict[str, int]] = {}
+        self.skipped: Dict[str, dict] = {}
+        self.skipped_count = 0
+        self.bytes_saved = 0
+
+    def skip(self, path: str, size: int, reason: str):
+        bucket = self.by_reason.setdefault(reason, {"files": 0, "bytes": 0})
+        bucket["files"] += 1
+        bucket["bytes"] += size
+        self.skipped_count += 1
+        self.bytes_saved += size
+        if len(self.skipped) < self.MAX_LISTED:
+            self.skipped[path] = {"size": size, "reason": reason}
+
+    def summary(self) -> dict:
+        return {
+            "skipped_files": self.skipped_count,
+            "bytes_saved": self.bytes_saved,
+            "by_reason": self.by_reason,
+        }
+
+
+def gitignores_in(entries: List[Tuple[str, bytes]]) -> List[Tuple[str, str]]:
+    """Pick out decodable .gitignore files from (path, bytes) pairs."""
+    found = []
+    for path, data in entries:
+        if os.path.basename(path.replace("\\", "/")) == ".gitignore":
+            try:
+                found.append((path, data.decode("utf-8")))
+            except UnicodeDecodeError:
+                pass
+    return found
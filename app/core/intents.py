@@ -1,28 +1,130 @@
-from dataclasses import dataclass
-from typing import Optional
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+# ─── Vocabulary ──────────────────────────────────────────────────
+CREATE_WORDS = {"create", "generate", "scaffold", "bootstrap", "make", "build", "new", "setup", "set", "up", "init", "start"}
+EXPLAIN_WORDS = {"explain", "describe", "overview", "how", "works", "work", "does"}
+# The only subject the explain template answers
+ARCHITECTURE_WORDS = {"architecture", "idp", "platform"}
+TARGET_WORDS = {"service", "microservice", "app", "application", "api", "server", "project", "worker",
+                "boilerplate", "starter", "skeleton", "template", "backend", "rest"}
+FILLER_WORDS = {"a", "an", "the", "me", "for", "please", "simple", "basic", "minimal", "quick", "i", "need",
+                "want", "can", "you", "my", "our", "of", "to", "in", "is", "it", "on", "port", "called",
+                "named", "with", "using", "based", "what", "this", "standard"}
+
+# Stack keyword → canonical template key (order matters: most specific first)
+STACK_KEYWORDS = [
+    ({"celery", "worker", "queue", "background", "job", "jobs"}, "python-worker", {"python", "py"}),
+    ({"node", "nodejs", "node.js", "express", "javascript", "js"}, "node", None),
+    ({"python", "fastapi", "py"}, "python", None),
+    ({"go", "golang"}, "go", None),
+    ({"java", "spring", "springboot", "spring-boot", "boot"}, "java", None),
+]
+
+# Weighted keyword sets per request kind — the highest total wins
+KIND_KEYWORDS = {
+    "question": {"explain": 3, "describe": 3, "summarize": 3, "overview": 2, "what": 2, "why": 2,
+                 "how": 2, "where": 2, "which": 1, "understand": 2, "show": 1, "list": 1, "does": 1,
+                 "architecture": 1, "flow": 1, "purpose": 2},
+    "edit": {"fix": 2, "rename": 3, "typo": 3, "change": 2, "update": 2, "tweak": 2, "bump": 2,
+             "replace": 2, "remove": 2, "delete": 2, "add": 1, "comment": 1, "log": 1, "logging": 1},
+    "refactor": {"refactor": 3, "migrate": 3, "rewrite": 3, "restructure": 3, "redesign": 3,
+                 "implement": 2, "convert": 2, "integrate": 2, "every": 2, "across": 2, "entire": 2,
+                 "all": 1, "feature": 1, "tests": 1, "module": 1, "optimize": 2, "split": 2},
+    "scaffold": {"create": 2, "generate": 2, "scaffold": 3, "bootstrap": 3, "boilerplate": 3,
+                 "new": 1, "service": 1, "microservice": 2, "starter": 2},
+}
+
+KNOWN_WORDS = CREATE_WORDS | EXPLAIN_WORDS | ARCHITECTURE_WORDS | TARGET_WORDS | FILLER_WORDS
+for _keywords, _, _requires in STACK_KEYWORDS:
+    KNOWN_WORDS |= _keywords | (_requires or set())
+
+_NAME = re.compile(r"\b(?:called|named)\s+[\"']?([a-zA-Z][\w\-]*)")
+_PORT = re.compile(r"\bport\s+(\d{2,5})\b")
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9.\-]*")
+
 
 @dataclass
 class Intent:
     action: str  # "create", "explain"
-    tech_stack: Optional[str]  # "node", "python", None
+    tech_stack: Optional[str]  # "node", "python", "go", "java", "python-worker", None
     target: str  # "service", "architecture"
+    confidence: float = 0.0  # How sure we are a template fully answers the request
+    service_name: Optional[str] = None
+    port: Optional[int] = None
+    kind: str = "edit"  # "question", "edit", "refactor", "scaffold"
+    scores: Dict[str, int] = field(default_factory=dict)
 
 class IntentParser:
     def parse(self, message: str) -> Intent:
         msg = message.lower()
-        
+        # The service name is free text — keep it out of the vocabulary check
+        tokens = [t.strip(".-") for t in _TOKEN.findall(_NAME.sub(" ", message).lower())]
+        words = set(tokens)
+
         # Default intent
         action = "create"
         tech_stack = None
         target = "service"
-        
-        if "explain" in msg or "architecture" in msg:
+
+        if "explain" in words or "architecture" in words:
             action = "explain"
             target = "architecture"
-        
-        if "node" in msg or "express" in msg:
-            tech_stack = "node"
-        elif "python" in msg or "fastapi" in msg:
-            tech_stack = "python"
-            
-        return Intent(action=action, tech_stack=tech_stack, target=target)
+
+        stacks = [
+            stack for keywords, stack, requires in STACK_KEYWORDS
+            if words & keywords and (requires is None or words & requires)
+        ]
+        if "python-worker" in stacks and "python" in stacks:
+            stacks.remove("python")  # "python worker" is one stack
+        if stacks:
+            tech_stack = stacks[0]
+
+        name_match = _NAME.search(message)
+        port_match = _PORT.search(msg)
+        service_name = _slugify(name_match.group(1)) if name_match else None
+        port = int(port_match.group(1)) if port_match else None
+
+        intent = Intent(
+            action=action, tech_stack=tech_stack, target=target,
+            service_name=service_name, port=port
+        )
+        intent.confidence = self._confidence(intent, tokens, words, len(stacks))
+        intent.scores = self._kind_scores(tokens, msg)
+        intent.kind = max(intent.scores, key=intent.scores.get) if any(intent.scores.values()) else "edit"
+        return intent
+
+    def _kind_scores(self, tokens: list, msg: str) -> Dict[str, int]:
+        scores = {
+            kind: sum(weights.get(t, 0) for t in tokens)
+            for kind, weights in KIND_KEYWORDS.items()
+        }
+        if msg.rstrip().endswith("?"):
+            scores["question"] += 2
+        return scores
+
+    def _confidence(self, intent: Intent, tokens: list, words: set, stack_count: int) -> float:
+        """
+        High only when every word is accounted for by known vocabulary, so
+        requests with extra requirements ("...with JWT auth and Postgres")
+        fall through to the LLM instead of getting a generic template.
+        Explaining anything but the platform architecture, or naming more
+        than one stack, is left to the LLM too.
+        """
+        unknown = [t for t in tokens if t not in KNOWN_WORDS and not t.isdigit()]
+
+        if intent.action == "explain":
+            about_platform = words & ARCHITECTURE_WORDS and not stack_count and not (words & TARGET_WORDS)
+            return 0.9 if about_platform and not unknown else 0.4
+        if stack_count > 1:
+            return 0.3
+        if intent.tech_stack is None or not (words & CREATE_WORDS) or not (words & TARGET_WORDS):
+            return 0.2
+        if not unknown:
+            return 0.95
+        return 0.6 if len(unknown) == 1 else 0.3
+
+
+def _slugify(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "my-service"
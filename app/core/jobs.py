@@ -0,0 +1,150 @@
+"""
+Background Job Queue for long-running operations.
+
+Codebase chats, ingestion and analysis can outlive an HTTP request. They
+are submitted here instead: the caller gets a job id immediately, a
+bounded worker pool runs the work, and progress/results are polled or
+streamed. Admission is capped by queue depth so overload turns into
+queueing (or a fast 503) rather than proxy timeouts.
+
+Finished jobs are persisted to disk so results survive a restart.
+"""
+import itertools
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Optional
+
+
+class JobQueueFull(Exception):
+    """Raised when the pending queue is at its admission limit."""
+
+
+class JobManager:
+    def __init__(self, max_workers: int, max_queue: int, history_limit: int, persistence_file: str):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.history_limit = history_limit
+        self.persistence_file = persistence_file
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._pending: list = []  # Job ids waiting for a worker, FIFO
+        self.jobs: dict = self._load()
+
+    # ─── Public API ─────────────────────────────────────────────
+    def submit(self, job_type: str, fn: Callable, *args, **kwargs) -> dict:
+        """
+        Queue `fn(report, *args, **kwargs)` and return the job record.
+
+        `report(progress, message)` lets the work publish progress
+        (0-100). The return value of `fn` becomes the job's result.
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                raise JobQueueFull(f"Job queue is full ({self.max_queue} pending)")
+            job_id = f"job-{uuid.uuid4().hex[:12]}"
+            job = {
+                "id": job_id,
+                "type": job_type,
+                "status": "queued",
+                "progress": 0,
+                "message": "Waiting for a worker",
+                "created_at": datetime.now().isoformat(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+                "version": next(self._seq),
+            }
+            self.jobs[job_id] = job
+            self._pending.append(job_id)
+
+        self._pool.submit(self._run, job_id, fn, args, kwargs)
+        return self.snapshot(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[dict]:
+        """Copy of a job record (with its current queue position)."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            snap = dict(job)
+            if job_id in self._pending:
+                snap["queue_position"] = self._pending.index(job_id) + 1
+            return snap
+
+    def list(self, limit: int = 50) -> list:
+        with self._lock:
+            recent = sorted(self.jobs.values(), key=lambda j: j["created_at"], reverse=True)[:limit]
+            return [{k: v for k, v in job.items() if k != "result"} for job in recent]
+
+    def stats(self) -> dict:
+        with self._lock:
+            running = sum(1 for j in self.jobs.values() if j["status"] == "running")
+            return {
+                "pending": len(self._pending),
+                "running": running,
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+            }
+
+    # ─── Internals ──────────────────────────────────────────────
+    def _run(self, job_id: str, fn: Callable, args: tuple, kwargs: dict):
+        with self._lock:
+            self._pending.remove(job_id)
+        self._update(job_id, status="running", message="Running", started_at=datetime.now().isoformat())
+
+        def report(progress: int, message: str = ""):
+            self._update(job_id, progress=max(0, min(100, int(progress))), message=message)
+
+        try:
+            result = fn(report, *args, **kwargs)
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            self._update(
+                job_id, status="failed", error=str(e), message="Failed",
+                finished_at=datetime.now().isoformat()
+            )
+        else:
+            self._update(
+                job_id, status="succeeded", progress=100, result=result, message="Done",
+                finished_at=datetime.now().isoformat()
+            )
+        self._save()
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self.jobs[job_id]
+            job.update(fields)
+            job["version"] = next(self._seq)
+
+    def _load(self) -> dict:
+        if os.path.exists(self.persistence_file):
+            try:
+                with open(self.persistence_file, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading jobs: {e}")
+        return {}
+
+    def _save(self):
+        """Persist finished jobs, keeping only the most recent `history_limit`."""
+        with self._lock:
+            finished = [j for j in self.jobs.values() if j["status"] in ("succeeded", "failed")]
+            finished.sort(key=lambda j: j["created_at"])
+            for job in finished[:-self.history_limit]:
+                del self.jobs[job["id"]]
+            data = {j["id"]: j for j in finished[-self.history_limit:]}
+            try:
+                # Write to a temp file and swap it in so a crash can't truncate the history
+                temp_file = self.persistence_file + ".tmp"
+                with open(temp_file, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(temp_file, self.persistence_file)
+            except Exception as e:
+                print(f"Error saving jobs: {e}")
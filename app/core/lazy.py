@@ -0,0 +1,57 @@
+"""
+Lazy Initialization.
+
+Heavy singletons (the LLM client, data stores, persisted codebases and
+jobs, the static asset bundle) are built on first use instead of at
+import, so importing the app — worker boot, test collection, CLI tools —
+doesn't pay for what a request may never touch.
+
+Named instances are registered so the app's lifespan can warm them all in
+the background (warm_up) and the readiness probe can report which are
+built (readiness).
+"""
+import threading
+from typing import Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+_UNSET = object()
+
+_registry: Dict[str, "Lazy"] = {}
+
+
+class Lazy(Generic[T]):
+    """Value built by `factory` on the first get(), exactly once, thread-safely."""
+
+    def __init__(self, factory: Callable[[], T], name: str = ""):
+        self._factory = factory
+        self._value = _UNSET
+        self._lock = threading.Lock()
+        if name:
+            _registry[name] = self
+
+    def get(self) -> T:
+        if self._value is _UNSET:
+            with self._lock:
+                if self._value is _UNSET:
+                    self._value = self._factory()
+        return self._value
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not _UNSET
+
+
+def warm_up() -> Dict[str, str]:
+    """Build every named instance; returns {name: error} for those whose factory raised."""
+    errors = {}
+    for name, lazy in list(_registry.items()):
+        try:
+            lazy.get()
+        except Exception as e:
+            print(f"Warm-up of {name} failed: {e}")
+            errors[name] = str(e)
+    return errors
+
+
+def readiness() -> Dict[str, bool]:
+    return {name: lazy.ready for name, lazy in _registry.items()}
@@ -7,61 +7,169 @@ Uses smart chunking to stay within Groq's rate limits:
   - Truncates very large files
   - Only sends the most relevant files
 """
-import openai
-from openai import OpenAI
 import json
 import os
-from app.core.config import GROK_API_KEY, GROK_BASE_URL
-from app.core.prompts import SYSTEM_PROMPT, CODEBASE_AWARE_PROMPT
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from app.core.config import (
+    GROK_API_KEY, GROK_BASE_URL,
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES, LLM_MAX_QUEUE_WAIT, CODEBASE_EDIT_MODE, ROUTE_MODELS
+)
+from app.core.intents import IntentParser
+from app.core.routing import ModelRouter
+from app.core.patches import apply_edits
+from app.core.prompts import (
+    SYSTEM_PROMPT, CODEBASE_AWARE_PROMPT, CODEBASE_PATCH_PROMPT,
+    CODEBASE_CONTEXT_TEMPLATE, USER_REQUEST_TEMPLATE, HISTORY_SUMMARY_PROMPT
+)
+from app.core.context_cache import LRUCache
+from app.core.manifest import ManifestTree
+from app.core.sharding import is_repo_wide, pack_shards, merge_shard_results
+from app.core.summaries import summary_index
+from app.core.ratelimit import RateLimitScheduler, RateLimitQueueTimeout, PRIORITY_HIGH, PRIORITY_LOW
+from app.core.singleflight import SingleFlight, flight_key
 from app.models import ChatResponse
 
 # ─── Smart Chunking Config ──────────────────────────────────────
 MAX_CONTEXT_CHARS = 16000        # ~4000 tokens (4 chars ≈ 1 token)
 MAX_FILE_CHARS = 3000            # Truncate individual files at ~750 tokens
 MAX_FILES_IN_CONTEXT = 8         # Never send more than 8 files
+SUMMARY_BUDGET_CHARS = 3000      # Reserved for summaries of files not sent in full
+MANIFEST_MAX_TOKENS = 1000       # Compact tree manifest is trimmed to fit this
 SKIP_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.ico', '.svg',
                    '.woff', '.woff2', '.ttf', '.eot', '.mp4', '.zip',
                    '.tar', '.gz', '.lock', '.map'}
 
+# ─── Map-Reduce Config ──────────────────────────────────────────
+SHARD_MAX_FILES = 64             # Relevant files considered for a repo-wide request
+SHARD_MAX_COUNT = 8              # Upper bound on concurrent shard calls per request
+
+# ─── Scheduling Config ──────────────────────────────────────────
+COMPLETION_TOKEN_ESTIMATE = 1024  # Reserved for the response when budgeting
+
+# ─── Context Cache Config ───────────────────────────────────────
+CONTEXT_CACHE_SIZE = 64          # Assembled contexts kept across turns
+
+
+def _sdk():
+    """The openai module. Imported on demand; LLMService.__init__ has always loaded it first."""
+    import openai
+    return openai
+
 
 class LLMService:
     def __init__(self):
         if not GROK_API_KEY:
             raise ValueError("GROK_API_KEY is not set in environment variables.")
 
+        # The SDK is imported here, not at module level: it dominates app import time
+        from openai import OpenAI
+
+        # Retries are owned by the scheduler, not the SDK
         self.client = OpenAI(
             api_key=GROK_API_KEY,
-            base_url=GROK_BASE_URL
+            base_url=GROK_BASE_URL,
+            max_retries=0
+        )
+        # Provider rate limits are per model, so each model gets a scheduler
+        self.schedulers = {
+            model: RateLimitScheduler(
+                requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+                tokens_per_minute=LLM_TOKENS_PER_MINUTE,
+                max_concurrency=LLM_MAX_CONCURRENCY,
+                max_retries=LLM_MAX_RETRIES,
+                max_queue_wait=LLM_MAX_QUEUE_WAIT
+            )
+            for model in set(ROUTE_MODELS.values())
+        }
+        self.intent_parser = IntentParser()
+        self.router = ModelRouter()
+        self.flights = SingleFlight()
+        self.context_cache = LRUCache(maxsize=CONTEXT_CACHE_SIZE)
+
+    # ─── Scheduled Completion ───────────────────────────────────
+    def _complete(
+        self,
+        messages: list,
+        *,
+        model: str = ROUTE_MODELS["large"],
+        priority: int = PRIORITY_HIGH,
+        context_version: Optional[str] = None,
+        on_queue_position: Optional[Callable[[int], None]] = None
+    ) -> str:
+        """
+        Run one JSON-mode completion through the model's rate-limit scheduler.
+        Identical in-flight requests (same model, messages and context
+        version) share a single upstream call.
+        """
+        key = flight_key(model, messages, context_version)
+        content, _ = self.flights.do(
+            key, lambda: self._scheduled_completion(messages, model, priority, on_queue_position)
+        )
+        return content
+
+    def _scheduled_completion(
+        self,
+        messages: list,
+        model: str,
+        priority: int,
+        on_queue_position: Optional[Callable[[int], None]]
+    ) -> str:
+        estimated_tokens = sum(len(m["content"]) for m in messages) // 4 + COMPLETION_TOKEN_ESTIMATE
+
+        def call():
+            return self.client.chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                temperature=0.1,
+                response_format={"type": "json_object"}
+            )
+
+        raw = self.schedulers[model].submit(
+            call,
+            priority=priority,
+            estimated_tokens=estimated_tokens,
+            on_queue_position=on_queue_position
         )
+        response = raw.parse()
+        return response.choices[0].message.content
 
     # ─── Standard Chat (no codebase) ────────────────────────────
-    def process_command(self, user_message: str) -> ChatResponse:
+    def process_command(
+        self,
+        user_message: str,
+        on_queue_position: Optional[Callable[[int], None]] = None,
+        priority: int = PRIORITY_HIGH,
+        history: Optional[list] = None
+    ) -> ChatResponse:
         try:
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
+            route = self.router.route(self.intent_parser.parse(user_message), user_message)
+            content = self._complete(
+                [
                     {"role": "system", "content": SYSTEM_PROMPT},
+                    *(history or []),
                     {"role": "user", "content": user_message}
                 ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
+                model=route.model,
+                priority=priority,
+                on_queue_position=on_queue_position
             )
-
-            content = response.choices[0].message.content
             content = _clean_json(content)
             data = json.loads(content)
 
             return ChatResponse(
                 folder_structure=data.get("folder_structure", ""),
                 files=data.get("files", {}),
-                explanation=data.get("explanation", "")
+                explanation=data.get("explanation", ""),
+                model=route.model
             )
 
-        except openai.RateLimitError:
+        except (_sdk().RateLimitError, RateLimitQueueTimeout):
             return ChatResponse(
                 explanation="⚠️ API Rate Limit Exceeded. Please wait a few seconds before trying again."
             )
-        except openai.APIError as e:
+        except _sdk().APIError as e:
             print(f"LLM API Error: {e}")
             return ChatResponse(
                 explanation=f"⚠️ AI Service Error: {e.message}"
@@ -72,8 +180,32 @@ class LLMService:
                 explanation=f"I encountered an error processing your request: {str(e)}"
             )
 
+    # ─── Session History ────────────────────────────────────────
+    def summarize_history(self, previous_summary: str, messages: list) -> str:
+        """Fold conversation turns into a running summary using the fast model."""
+        transcript = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+        content = self._complete(
+            [
+                {"role": "system", "content": HISTORY_SUMMARY_PROMPT},
+                {"role": "user", "content": f"PREVIOUS SUMMARY:\n{previous_summary or '(none)'}\n\nNEW MESSAGES:\n{transcript}"}
+            ],
+            model=ROUTE_MODELS["fast"],
+            priority=PRIORITY_LOW
+        )
+        return json.loads(_clean_json(content)).get("summary", "")
+
     # ─── Codebase-Aware Chat ────────────────────────────────────
-    def process_with_codebase(self, user_message: str, codebase_files: dict) -> ChatResponse:
+    def process_with_codebase(
+        self,
+        user_message: str,
+        codebase_files: dict,
+        context_version: Optional[str] = None,
+        on_queue_position: Optional[Callable[[int], None]] = None,
+        edit_mode: Optional[str] = None,
+        sharded: Optional[bool] = None,
+        priority: int = PRIORITY_HIGH,
+        history: Optional[list] = None
+    ) -> ChatResponse:
         """
         Process a user request with uploaded codebase context.
         Uses smart chunking to fit within token limits.
@@ -81,44 +213,43 @@ class LLMService:
         Args:
             user_message: The user's natural language request
             codebase_files: Dict of {filename: {content, size, type}}
+            context_version: Identifies the codebase revision (e.g. "cb-001:3")
+            on_queue_position: Optional callback for rate-limit queue position
+            edit_mode: "patch" (search/replace edits) or "full" (whole files);
+                       defaults to CODEBASE_EDIT_MODE
+            sharded: Force (True) or disable (False) map-reduce processing;
+                     None auto-detects repo-wide requests
+            priority: Scheduler priority (batch/background work passes PRIORITY_LOW)
+            history: Prior session messages, placed between context and request
         """
+        mode = edit_mode or CODEBASE_EDIT_MODE
         try:
-            # 1. Smart chunk: pick relevant files, respect token budget
-            context = self._build_smart_context(user_message, codebase_files)
-
-            # 2. Build the prompt
-            # 2. Build the prompt
-            full_prompt = CODEBASE_AWARE_PROMPT.replace(
-                "{codebase_context}", context
-            ).replace(
-                "{user_message}", user_message
-            )
+            intent = self.intent_parser.parse(user_message)
+            if sharded is None:
+                sharded = is_repo_wide(user_message, intent.kind) and len(codebase_files) > MAX_FILES_IN_CONTEXT
+            if sharded:
+                return self._process_sharded(
+                    user_message, codebase_files, mode, context_version, on_queue_position, priority,
+                    history
+                )
 
-            # 3. Call LLM
-            response = self.client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[
-                    {"role": "user", "content": full_prompt}
-                ],
-                temperature=0.1,
-                response_format={"type": "json_object"}
-            )
+            # 1. Smart chunk: pick relevant files, respect token budget
+            context = self._build_smart_context(user_message, codebase_files, context_version)
 
-            content = response.choices[0].message.content
-            content = _clean_json(content)
-            data = json.loads(content)
+            # 2. Route by intent and context size
+            route = self.router.route(intent, user_message, context_chars=len(context))
 
-            return ChatResponse(
-                files=data.get("files", {}),
-                changes=data.get("changes", []),
-                explanation=data.get("explanation", "")
+            # 3-5. Prompt, call and apply
+            return self._codebase_completion(
+                user_message, context, codebase_files, mode, route.model, context_version,
+                on_queue_position, priority, history
             )
 
-        except openai.RateLimitError:
+        except (_sdk().RateLimitError, RateLimitQueueTimeout):
             return ChatResponse(
                 explanation="⚠️ API Rate Limit Exceeded. Please wait a few seconds before trying again."
             )
-        except openai.APIError as e:
+        except _sdk().APIError as e:
             print(f"LLM Codebase API Error: {e}")
             return ChatResponse(
                 explanation=f"⚠️ AI Service Error: {e.message}"
@@ -129,8 +260,127 @@ class LLMService:
                 explanation=f"Error processing codebase request: {str(e)}"
             )
 
+    def _codebase_completion(
+        self,
+        user_message: str,
+        context: str,
+        codebase_files: dict,
+        mode: str,
+        model: str,
+        context_version: Optional[str],
+        on_queue_position: Optional[Callable[[int], None]],
+        priority: int = PRIORITY_HIGH,
+        history: Optional[list] = None
+    ) -> ChatResponse:
+        """One codebase-aware completion over an already-assembled context."""
+        # Build the prompt — stable parts first, session history, the request last
+        messages = [
+            {"role": "system", "content": CODEBASE_PATCH_PROMPT if mode == "patch" else CODEBASE_AWARE_PROMPT},
+            {"role": "user", "content": CODEBASE_CONTEXT_TEMPLATE.replace("{codebase_context}", context)},
+            *(history or []),
+            {"role": "user", "content": USER_REQUEST_TEMPLATE.replace("{user_message}", user_message)}
+        ]
+
+        content = self._complete(
+            messages,
+            model=model,
+            priority=priority,
+            context_version=context_version,
+            on_queue_position=on_queue_position
+        )
+        content = _clean_json(content)
+        data = json.loads(content)
+
+        files = data.get("files", {})
+        if mode == "patch":
+            # Apply edits locally; fall back to full files if any edit misses
+            patched, failures = apply_edits(
+                {p: info.get("content", "") for p, info in codebase_files.items()},
+                data.get("edits", [])
+            )
+            if failures:
+                print(f"Patch mode fallback to full files: {failures}")
+                return self._codebase_completion(
+                    user_message, context, codebase_files, "full", model, context_version,
+                    on_queue_position, priority, history
+                )
+            files = {**files, **patched}
+
+        return ChatResponse(
+            files=files,
+            changes=data.get("changes", []),
+            explanation=data.get("explanation", ""),
+            model=model
+        )
+
+    def _process_sharded(
+        self,
+        user_message: str,
+        codebase_files: dict,
+        mode: str,
+        context_version: Optional[str],
+        on_queue_position: Optional[Callable[[int], None]],
+        priority: int = PRIORITY_HIGH,
+        history: Optional[list] = None
+    ) -> ChatResponse:
+        """
+        Map-reduce a repo-wide request: pack the relevant files into
+        budget-sized shards, run them concurrently (the scheduler enforces
+        rate limits) and merge the results.
+        """
+        ranked = self._rank_files(user_message, codebase_files)[:SHARD_MAX_FILES]
+        manifest = self._build_manifest(codebase_files, [path for path, _, _ in ranked], context_version)
+        shards = pack_shards(
+            [(path, _truncate(content)) for path, content, _ in ranked],
+            budget_chars=MAX_CONTEXT_CHARS - len(manifest),
+            max_files=MAX_FILES_IN_CONTEXT,
+            max_shards=SHARD_MAX_COUNT
+        )
+        covered = sum(len(shard) for shard in shards)
+        route = self.router.route(
+            self.intent_parser.parse(user_message), user_message, sharded=True
+        )
+
+        def run(index: int, shard: list) -> ChatResponse:
+            note = (
+                f"\n[Context: shard {index}/{len(shards)} of a repo-wide request "
+                f"({len(shard)} of {covered} relevant files). Only edit the files shown here; "
+                f"other shards handle the rest.]\n"
+            )
+            context = self._assemble_context(
+                manifest, shard, len(codebase_files), note, context_version=context_version
+            )
+            return self._codebase_completion(
+                user_message, context, codebase_files, mode, route.model, context_version,
+                on_queue_position if index == 1 else None, priority, history
+            )
+
+        with ThreadPoolExecutor(max_workers=min(len(shards), LLM_MAX_CONCURRENCY) or 1) as pool:
+            futures = [pool.submit(run, i, shard) for i, shard in enumerate(shards, start=1)]
+
+        results, errors = [], []
+        for index, future in enumerate(futures, start=1):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"LLM shard {index}/{len(shards)} failed: {e}")
+                errors.append((index, e))
+        if not results:
+            raise errors[0][1]
+
+        merged = merge_shard_results(results)
+        skipped = len(ranked) - covered
+        notes = [f"Processed {covered} files in {len(shards)} parallel shards."]
+        if skipped > 0:
+            notes.append(f"{skipped} lower-relevance files were not processed.")
+        for index, e in errors:
+            notes.append(f"Shard {index} failed: {e}")
+        merged.explanation = " ".join(notes) + "\n\n" + merged.explanation
+        merged.model = route.model
+        return merged
+
     # ─── Smart Chunking Engine ──────────────────────────────────
-    def _build_smart_context(self, query: str, files: dict) -> str:
+    def _build_smart_context(self, query: str, files: dict, context_version: Optional[str] = None) -> str:
         """
         Select and format the most relevant files within the token budget.
 
@@ -139,7 +389,47 @@ class LLMService:
           2. Sort by score (highest first)
           3. Include files until we hit the token budget
           4. Truncate large files with a [TRUNCATED] marker
+          5. Summarize the files left out within SUMMARY_BUDGET_CHARS
+
+        The output is ordered for prefix stability — manifest first, then the
+        selected files sorted by path. When `context_version` is given the
+        file blocks are cached per (version, selected file set); the manifest
+        focus and the summaries depend on the query, so they are assembled
+        on every call.
+        """
+        ranked = self._rank_files(query, files)
+        manifest = self._build_manifest(
+            files, [path for path, _, _ in ranked[:MAX_FILES_IN_CONTEXT]], context_version
+        )
+        summary_budget = SUMMARY_BUDGET_CHARS if len(files) > MAX_FILES_IN_CONTEXT else 0
+        selected = self._select_files(query, files, len(manifest) + summary_budget, ranked)
+        chosen = {path for path, _ in selected}
+        summaries, summarized = summary_index.context_block(
+            files, [path for path, _, _ in ranked if path not in chosen], summary_budget
+        )
+        return self._assemble_context(
+            manifest, selected, len(files), summaries=summaries, summarized=summarized,
+            context_version=context_version
+        )
+
+    def _cached(self, key: tuple, build: Callable, context_version: Optional[str]):
+        """Cache only when the codebase revision is known."""
+        if context_version is None:
+            return build()
+        return self.context_cache.get_or_build(key, build)
+
+    def _build_manifest(self, files: dict, focus: list, context_version: Optional[str] = None) -> str:
+        """
+        Always include a file manifest first (cheap, very useful for LLM).
+        Rendered as a compact tree within MANIFEST_MAX_TOKENS; the tree is
+        cached per codebase version and `focus` paths stay expanded when it
+        has to be trimmed.
         """
+        tree = self._cached(("manifest", context_version), lambda: ManifestTree(files), context_version)
+        return tree.render(MANIFEST_MAX_TOKENS * 4, focus)
+
+    def _rank_files(self, query: str, files: dict) -> list:
+        """Return [(path, content, score)] for all code files, best first."""
         query_lower = query.lower()
         query_words = set(query_lower.split())
 
@@ -160,47 +450,60 @@ class LLMService:
 
         # Sort by relevance score (highest first)
         scored_files.sort(key=lambda x: x[2], reverse=True)
-
-        # Build context within budget
-        context_parts = []
-        total_chars = 0
-        files_included = 0
-
-        # Always include a file manifest first (cheap, very useful for LLM)
-        manifest = "### FILE MANIFEST (all files in project):\n"
-        manifest += "\n".join(f"  - {p}" for p in sorted(files.keys()))
-        manifest += "\n\n"
-        context_parts.append(manifest)
-        total_chars += len(manifest)
-
-        # Add relevant files
-        for path, content, score in scored_files:
-            if files_included >= MAX_FILES_IN_CONTEXT:
+        return scored_files
+
+    def _select_files(self, query: str, files: dict, used_chars: int, ranked: Optional[list] = None) -> list:
+        """Return [(path, content)] for the top-scoring files that fit the budget."""
+        selected = []
+        total_chars = used_chars
+        if ranked is None:
+            ranked = self._rank_files(query, files)
+        for path, content, score in ranked:
+            if len(selected) >= MAX_FILES_IN_CONTEXT:
                 break
 
             # Truncate large files
-            if len(content) > MAX_FILE_CHARS:
-                content = content[:MAX_FILE_CHARS] + f"\n\n... [TRUNCATED — file is {len(content)} chars, showing first {MAX_FILE_CHARS}]"
+            content = _truncate(content)
 
-            file_block = f"### FILE: {path}\n```\n{content}\n```\n\n"
+            block_chars = len(_file_block(path, content))
 
             # Check budget
-            if total_chars + len(file_block) > MAX_CONTEXT_CHARS:
+            if total_chars + block_chars > MAX_CONTEXT_CHARS:
                 # If we haven't included any files yet, force-include this one (truncated more)
-                if files_included == 0:
+                if not selected:
                     remaining = MAX_CONTEXT_CHARS - total_chars - 100
                     content = content[:remaining]
-                    file_block = f"### FILE: {path}\n```\n{content}\n```\n\n"
+                    block_chars = len(_file_block(path, content))
                 else:
                     break
 
-            context_parts.append(file_block)
-            total_chars += len(file_block)
-            files_included += 1
+            selected.append((path, content))
+            total_chars += block_chars
+
+        return selected
+
+    def _assemble_context(
+        self,
+        manifest: str,
+        selected: list,
+        total_files: int,
+        note: Optional[str] = None,
+        summaries: str = "",
+        summarized: int = 0,
+        context_version: Optional[str] = None
+    ) -> str:
+        # File blocks don't depend on the query; cached per (version, selected file set)
+        blocks = self._cached(
+            ("files", context_version, tuple(sorted(path for path, _ in selected))),
+            lambda: "".join(_file_block(path, content) for path, content in sorted(selected)),
+            context_version
+        )
+        context_parts = [manifest, blocks, summaries]
 
         # Add a note about what was included
-        total_files = len(files)
-        note = f"\n[Context: {files_included}/{total_files} files included based on relevance to your query. Full manifest above.]\n"
+        if note is None:
+            more = f"; {summarized} more summarized below" if summarized else ""
+            note = f"\n[Context: {len(selected)}/{total_files} files included based on relevance to your query{more}. Full manifest above.]\n"
         context_parts.append(note)
 
         return "".join(context_parts)
@@ -267,6 +570,16 @@ class LLMService:
         return score
 
 
+def _truncate(content: str) -> str:
+    if len(content) > MAX_FILE_CHARS:
+        return content[:MAX_FILE_CHARS] + f"\n\n... [TRUNCATED — file is {len(content)} chars, showing first {MAX_FILE_CHARS}]"
+    return content
+
+
+def _file_block(path: str, content: str) -> str:
+    return f"### FILE: {path}\n```\n{content}\n```\n\n"
+
+
 def _clean_json(content: str) -> str:
     """Strip markdown code fences from LLM output."""
     content = content.strip()
@@ -0,0 +1,178 @@
+"""
+Compact File Manifest.
+
+The flat one-path-per-line manifest grows linearly with the repo and, for
+large uploads, crowds actual code out of the context window. This renders
+the file list as an indented tree instead:
+
+  - single-child directory chains are collapsed (src/main/java/com/acme/)
+  - directories with many files are aggregated ("tests/ (42 files: .py ×40)")
+  - when the tree still exceeds its budget, depth is trimmed, except along
+    the paths of the files relevant to the current request
+  - if that is not enough, unfocused entries inside those focused
+    directories are folded into one aggregate line per directory; only
+    then are lines cut
+
+The tree is built once per codebase version; the untrimmed rendering does
+not depend on the request, so it stays byte-identical across turns.
+"""
+import os
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.core.context_cache import LRUCache
+
+LEAF_LIST_MAX = 8                # Files listed per directory before aggregating
+MAX_EXTS_DESCRIBED = 3           # Extensions named in an aggregate line
+RENDER_CACHE_SIZE = 16           # Focus-specific trimmed renderings kept per tree
+
+
+class _Dir:
+    __slots__ = ("name", "path", "dirs", "files", "count", "exts", "ndirs")
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.dirs: Dict[str, "_Dir"] = {}
+        self.files: List[str] = []
+        self.count = 0
+        self.exts: Counter = Counter()
+        self.ndirs = 0
+
+
+class ManifestTree:
+    """Directory tree of a codebase, rendered within a character budget."""
+
+    def __init__(self, paths: Iterable[str]):
+        self.root = _Dir("", "")
+        for path in paths:
+            parts = path.replace("\\", "/").strip("/").split("/")
+            node = self.root
+            for part in parts[:-1]:
+                child = node.dirs.get(part)
+                if child is None:
+                    child = node.dirs[part] = _Dir(part, f"{node.path}/{part}" if node.path else part)
+                node = child
+            node.files.append(parts[-1])
+        self._finish(self.root)
+        for name in list(self.root.dirs):
+            self.root.dirs[name] = self._collapse(self.root.dirs[name])
+        self.height = self._height(self.root)
+        self._full: Optional[str] = None
+        self._trimmed = LRUCache(maxsize=RENDER_CACHE_SIZE)
+
+    def render(self, budget_chars: int, focus: Iterable[str] = ()) -> str:
+        """
+        Manifest text of at most ~`budget_chars`. Directories containing a
+        `focus` path are kept expanded when depth has to be trimmed.
+        """
+        if self._full is None:
+            self._full = self._render(max_depth=None, focus=set())
+        if len(self._full) <= budget_chars:
+            return self._full
+
+        # Focused files plus every directory on their paths
+        focus_set = set()
+        for path in focus:
+            parts = path.replace("\\", "/").split("/")
+            focus_set.update("/".join(parts[:i]) for i in range(1, len(parts) + 1))
+        key = (budget_chars, frozenset(focus_set))
+        return self._trimmed.get_or_build(key, lambda: self._fit(budget_chars, focus_set))
+
+    # ─── Construction ───────────────────────────────────────────
+    def _finish(self, node: _Dir):
+        node.files.sort()
+        node.count = len(node.files)
+        node.exts.update(os.path.splitext(f)[1].lower() or f for f in node.files)
+        for child in node.dirs.values():
+            self._finish(child)
+            node.count += child.count
+            node.exts.update(child.exts)
+            node.ndirs += 1 + child.ndirs
+
+    def _collapse(self, node: _Dir) -> _Dir:
+        while not node.files and len(node.dirs) == 1:
+            (child,) = node.dirs.values()
+            child.name = f"{node.name}/{child.name}"
+            node = child
+        for name in list(node.dirs):
+            node.dirs[name] = self._collapse(node.dirs[name])
+        return node
+
+    def _height(self, node: _Dir) -> int:
+        return 1 + max((self._height(c) for c in node.dirs.values()), default=0)
+
+    # ─── Rendering ──────────────────────────────────────────────
+    def _fit(self, budget_chars: int, focus: Set[str]) -> str:
+        for fold in (False, True):
+            for max_depth in range(self.height, -1, -1):
+                text = self._render(max_depth, focus, fold)
+                if len(text) <= budget_chars:
+                    return text
+        # Even the folded top level is too wide: cut lines and say how many were dropped
+        lines = text.split("\n")
+        kept, used = [], 0
+        for line in lines:
+            if used + len(line) + 40 > budget_chars:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        return "\n".join(kept) + f"\n  ... (+{len(lines) - len(kept)} more entries)\n\n"
+
+    def _render(self, max_depth: Optional[int], focus: Set[str], fold: bool = False) -> str:
+        trimmed = max_depth is not None
+        header = f"### FILE MANIFEST ({self.root.count} files"
+        header += "; deep or large directories summarized):\n" if trimmed else "):\n"
+        lines = [header.rstrip("\n")]
+        self._render_dir(self.root, 0, max_depth, focus, lines, fold)
+        return "\n".join(lines) + "\n\n"
+
+    def _render_dir(
+        self, node: _Dir, depth: int, max_depth: Optional[int], focus: Set[str], lines: list, fold: bool = False
+    ):
+        """With `fold`, a focused directory's unfocused subdirectories share one aggregate line, as do its unfocused files."""
+        indent = "  " * (depth + 1)
+        folding = fold and node.path in focus
+        folded = []
+        for name in sorted(node.dirs):
+            child = node.dirs[name]
+            focused = child.path in focus
+            too_deep = max_depth is not None and depth >= max_depth
+            crowded_leaf = not child.dirs and len(child.files) > LEAF_LIST_MAX
+            if not focused and (too_deep or crowded_leaf):
+                if folding:
+                    folded.append(child)
+                else:
+                    lines.append(f"{indent}{child.name}/ ({_describe(child)})")
+                continue
+            lines.append(f"{indent}{child.name}/")
+            self._render_dir(child, depth + 1, max_depth, focus, lines, fold)
+        if folded:
+            exts = sum((child.exts for child in folded), Counter())
+            count = sum(child.count for child in folded)
+            lines.append(f"{indent}... +{len(folded)} other dirs ({count} files: {_describe_exts(exts)})")
+
+        prefix = f"{node.path}/" if node.path else ""
+        if folding:
+            shown = [f for f in node.files if f"{prefix}{f}" in focus]
+        elif len(node.files) <= LEAF_LIST_MAX:
+            lines.extend(f"{indent}{name}" for name in node.files)
+            return
+        else:
+            shown = [f for f in node.files if f"{prefix}{f}" in focus] if focus else []
+            shown = shown or node.files[:LEAF_LIST_MAX // 2]
+        lines.extend(f"{indent}{name}" for name in shown)
+        if len(shown) < len(node.files):
+            rest = Counter(os.path.splitext(f)[1].lower() or f for f in node.files if f not in shown)
+            lines.append(f"{indent}... +{len(node.files) - len(shown)} more files ({_describe_exts(rest)})")
+
+
+def _describe(node: _Dir) -> str:
+    dirs = f" in {node.ndirs} subdirs" if node.ndirs else ""
+    return f"{node.count} files{dirs}: {_describe_exts(node.exts)}"
+
+
+def _describe_exts(exts: Counter) -> str:
+    top = exts.most_common(MAX_EXTS_DESCRIBED)
+    more = ", ..." if len(exts) > MAX_EXTS_DESCRIBED else ""
+    return ", ".join(f"{ext} ×{n}" for ext, n in top) + more
@@ -0,0 +1,214 @@
+"""
+Patch Engine — applies model-generated edits to codebase files.
+
+Used by the patch edit mode of codebase-aware chat, where the model returns
+small edits instead of complete files. Two edit formats are accepted:
+  - Search/replace blocks: {"file": ..., "search": ..., "replace": ...}
+  - Unified diffs:         {"file": ..., "diff": "@@ -3,4 +3,5 @@ ..."}
+
+Matching is progressively fuzzier so minor drift in the model's copy of
+the original text (whitespace, indentation, a mistyped line) still applies:
+  1. Exact substring
+  2. Line match ignoring trailing whitespace
+  3. Line match ignoring indentation (replacement is re-indented)
+  4. Best line window by difflib similarity above FUZZY_THRESHOLD
+
+A block that matches in more than one place is an error, unless the edit
+carries a line number (a diff hunk header), in which case the nearest
+match wins. Failed edits make the caller fall back to full files.
+"""
+import difflib
+import re
+from typing import Dict, List, Optional, Tuple
+
+FUZZY_THRESHOLD = 0.85
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(Exception):
+    """Raised when an edit cannot be located in the target file."""
+
+
+# ─── Search / Replace ───────────────────────────────────────────
+def apply_search_replace(content: str, search: str, replace: str, near: Optional[int] = None) -> str:
+    """
+    Replace the (fuzzy) occurrence of `search` in `content`.
+
+    `near` is the 0-based line the block is expected at; it picks among
+    several matches. Without it an ambiguous block raises PatchError.
+    """
+    if not search.strip():
+        raise PatchError("Empty search block")
+
+    if search in content:
+        starts = _occurrences(content, search)
+        at = _choose(starts, near, search, key=lambda pos: content.count("\n", 0, pos))
+        return content[:at] + replace + content[at + len(search):]
+
+    lines = content.split("\n")
+    search_lines = search.strip("\n").split("\n")
+    replace_lines = replace.strip("\n").split("\n") if replace.strip("\n") else []
+
+    match = _find_block(lines, search_lines)
+    if match is None:
+        raise PatchError(f"Could not locate block starting with {search_lines[0].strip()!r}")
+
+    starts, reindent = match
+    start = _choose(starts, near, search)
+    if reindent:
+        replace_lines = _reindent(replace_lines, search_lines, lines[start:start + len(search_lines)])
+    return "\n".join(lines[:start] + replace_lines + lines[start + len(search_lines):])
+
+
+def _occurrences(content: str, search: str) -> List[int]:
+    starts, at = [], content.find(search)
+    while at != -1:
+        starts.append(at)
+        at = content.find(search, at + 1)
+    return starts
+
+
+def _choose(starts: List[int], near: Optional[int], search: str, key=lambda start: start) -> int:
+    """The only match, or the one whose line (`key`) is nearest to `near`."""
+    if len(starts) == 1:
+        return starts[0]
+    if near is None:
+        first = search.strip().split("\n")[0].strip()
+        raise PatchError(f"Block starting with {first!r} matches {len(starts)} places")
+    return min(starts, key=lambda start: abs(key(start) - near))
+
+
+def _find_block(lines: List[str], search_lines: List[str]) -> Optional[Tuple[List[int], bool]]:
+    """Return (start lines of the best matches, needs re-indent), or None."""
+    n = len(search_lines)
+    if n > len(lines):
+        return None
+    windows = range(len(lines) - n + 1)
+
+    for normalize, reindent in ((str.rstrip, False), (str.strip, True)):
+        target = [normalize(l) for l in search_lines]
+        starts = [i for i in windows if [normalize(l) for l in lines[i:i + n]] == target]
+        if starts:
+            return starts, reindent
+
+    target_text = "\n".join(l.strip() for l in search_lines)
+    best_ratio, best_starts = 0.0, []
+    matcher = difflib.SequenceMatcher(autojunk=False)
+    matcher.set_seq2(target_text)
+    for i in windows:
+        matcher.set_seq1("\n".join(l.strip() for l in lines[i:i + n]))
+        if matcher.quick_ratio() < FUZZY_THRESHOLD:
+            continue
+        ratio = matcher.ratio()
+        if ratio > best_ratio:
+            best_ratio, best_starts = ratio, [i]
+        elif ratio == best_ratio:
+            best_starts.append(i)
+    if best_starts and best_ratio >= FUZZY_THRESHOLD:
+        return best_starts, True
+    return None
+
+
+def _reindent(replace_lines: List[str], search_lines: List[str], matched: List[str]) -> List[str]:
+    """Shift replacement indentation by the first difference the match revealed."""
+    for old, new in zip(search_lines, matched):
+        if old.strip() and _indent(old) != _indent(new):
+            old_indent, new_indent = _indent(old), _indent(new)
+            break
+    else:
+        return replace_lines
+    out = []
+    for line in replace_lines:
+        if line.startswith(old_indent):
+            out.append(new_indent + line[len(old_indent):])
+        else:
+            out.append(line)
+    return out
+
+
+def _indent(line: str) -> str:
+    return line[:len(line) - len(line.lstrip())]
+
+
+# ─── Unified Diff ───────────────────────────────────────────────
+def apply_unified_diff(content: str, diff: str) -> str:
+    """Apply every hunk of a unified diff, locating each by its context and line number."""
+    hunks = _parse_hunks(diff)
+    if not hunks:
+        raise PatchError("No hunks found in diff")
+
+    offset = 0  # Lines added minus removed by earlier hunks
+    for old_start, old_lines, new_lines in hunks:
+        if old_lines:
+            near = max(old_start - 1 + offset, 0)
+            content = apply_search_replace(content, "\n".join(old_lines), "\n".join(new_lines), near=near)
+        else:
+            # Pure insertion: anchor on the line number from the header
+            lines = content.split("\n")
+            at = min(max(old_start + offset, 0), len(lines))
+            content = "\n".join(lines[:at] + new_lines + lines[at:])
+        offset += len(new_lines) - len(old_lines)
+    return content
+
+
+def _parse_hunks(diff: str) -> List[Tuple[int, List[str], List[str]]]:
+    hunks = []
+    current = None
+    for line in diff.split("\n"):
+        header = _HUNK_HEADER.match(line)
+        if header:
+            current = (int(header.group(1)), [], [])
+            hunks.append(current)
+            continue
+        if current is None or line.startswith(("---", "+++", "\\")):
+            continue
+        tag, body = line[:1], line[1:]
+        if tag == " " or line == "":
+            current[1].append(body)
+            current[2].append(body)
+        elif tag == "-":
+            current[1].append(body)
+        elif tag == "+":
+            current[2].append(body)
+
+    # Drop trailing blank context produced by a final newline in the diff text
+    for _, old, new in hunks:
+        while old and new and old[-1] == "" and new[-1] == "":
+            old.pop()
+            new.pop()
+    return hunks
+
+
+# ─── Batch Application ──────────────────────────────────────────
+def apply_edits(files: Dict[str, str], edits: List[dict]) -> Tuple[Dict[str, str], List[dict]]:
+    """
+    Apply a list of edits to file contents.
+
+    Args:
+        files: {path: current content}
+        edits: Model-produced edit objects (search/replace or diff)
+
+    Returns:
+        (updated, failures) — `updated` holds the full new content of every
+        touched file; `failures` lists {"file", "error"} for edits that
+        could not be applied.
+    """
+    updated: Dict[str, str] = {}
+    failures: List[dict] = []
+
+    for edit in edits:
+        path = edit.get("file", "")
+        current = updated.get(path, files.get(path))
+        if current is None:
+            failures.append({"file": path, "error": "File not found in codebase"})
+            continue
+        try:
+            if "diff" in edit:
+                updated[path] = apply_unified_diff(current, edit["diff"])
+            else:
+                updated[path] = apply_search_replace(current, edit.get("search", ""), edit.get("replace", ""))
+        except PatchError as e:
+            failures.append({"file": path, "error": str(e)})
+
+    return updated, failures
@@ -0,0 +1,289 @@
+"""
+Client-side Rate-Limit Scheduler for LLM calls.
+
+Sits in front of every completion request so bursts are queued instead of
+bouncing off the provider's 429:
+  - Two token buckets (requests/min and tokens/min), re-synced from the
+    provider's x-ratelimit-* response headers after every call
+  - A priority queue (lower number = served first, FIFO within a priority)
+  - A cap on concurrent in-flight requests
+  - Jittered exponential backoff on 429, honouring Retry-After
+  - Queue-position callbacks so callers can report "you are #3 in line"
+"""
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+# ─── Priorities ─────────────────────────────────────────────────
+PRIORITY_HIGH = 0        # Interactive chat
+PRIORITY_NORMAL = 5      # Default
+PRIORITY_LOW = 10        # Background work (summaries, batch items)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class RateLimitQueueTimeout(Exception):
+    """Raised when a request waits in the queue longer than allowed."""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """openai.RateLimitError (HTTP 429), matched by status so openai isn't imported until a client is built."""
+    return getattr(error, "status_code", None) == 429
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse Groq/OpenAI reset headers like '2m59.56s', '7.66s' or '120' into seconds."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(num) * _DURATION_UNITS[unit] for num, unit in parts)
+
+
+class TokenBucket:
+    """Classic token bucket; `capacity` tokens refill evenly over one minute."""
+
+    def __init__(self, capacity: float):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self.refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate if self.rate > 0 else 1.0
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+    def sync(self, remaining: float, reset_seconds: Optional[float], now: float, limit: Optional[float] = None):
+        """Align the bucket with what the provider reports."""
+        if limit:
+            self.capacity = float(limit)
+        self.tokens = min(float(remaining), self.capacity)
+        if reset_seconds and reset_seconds > 0 and self.tokens < self.capacity:
+            self.rate = (self.capacity - self.tokens) / reset_seconds
+        else:
+            self.rate = self.capacity / 60.0
+        self.updated = now
+
+
+class _Ticket:
+    __slots__ = ("priority", "seq", "tokens")
+
+    def __init__(self, priority: int, seq: int, tokens: float):
+        self.priority = priority
+        self.seq = seq
+        self.tokens = tokens
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class RateLimitScheduler:
+    """
+    Thread-safe admission control for blocking LLM calls.
+
+    `submit()` blocks the calling thread until the request is at the head of
+    the queue and both buckets have room, runs it, and retries 429s with
+    jittered backoff. Retries keep their original sequence number so a
+    request never loses its place to newer arrivals.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_concurrency: int = 4,
+        max_retries: int = 4,
+        max_queue_wait: float = 120.0,
+        base_backoff: float = 1.0,
+        max_backoff: float = 30.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.max_queue_wait = max_queue_wait
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._cond = threading.Condition()
+        self._queue: list = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+
+    # ─── Public API ─────────────────────────────────────────────
+    def submit(
+        self,
+        call: Callable,
+        *,
+        priority: int = PRIORITY_NORMAL,
+        estimated_tokens: int = 0,
+        on_queue_position: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Run `call()` once capacity allows and return its result.
+
+        Args:
+            call: Zero-arg function performing the request. If the result
+                  exposes `.headers` (raw OpenAI response), limits are synced.
+            priority: Lower runs first (see PRIORITY_* constants).
+            estimated_tokens: Prompt + expected completion tokens.
+            on_queue_position: Called with the 1-based position whenever it
+                  changes, and with 0 when the request starts running.
+        """
+        ticket = _Ticket(priority, next(self._seq), float(estimated_tokens))
+        attempt = 0
+        while True:
+            self._acquire(ticket, on_queue_position)
+            try:
+                result = call()
+            except Exception as e:
+                self._release()
+                if not is_rate_limit_error(e):
+                    raise
+                attempt += 1
+                retry_after = self._on_rate_limited(getattr(e, "response", None))
+                if attempt > self.max_retries:
+                    raise
+                delay = max(retry_after or 0.0, self._backoff(attempt))
+                print(f"LLM rate limited, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+                continue
+
+            self._release(getattr(result, "headers", None))
+            return result
+
+    def status(self) -> dict:
+        """Snapshot of queue depth and remaining budget."""
+        with self._cond:
+            now = time.monotonic()
+            self.requests.refill(now)
+            self.tokens.refill(now)
+            return {
+                "queued": len(self._queue),
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "requests_available": int(self.requests.tokens),
+                "tokens_available": int(self.tokens.tokens),
+                "paused_for_sec": round(max(0.0, self._paused_until - now), 2),
+            }
+
+    # ─── Internals ──────────────────────────────────────────────
+    def _acquire(self, ticket: _Ticket, on_queue_position: Optional[Callable[[int], None]]):
+        deadline = time.monotonic() + self.max_queue_wait
+        last_position = None
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            self._cond.notify_all()
+            while True:
+                now = time.monotonic()
+                if self._queue[0] is ticket:
+                    wait = self._wait_time(ticket, now)
+                    if wait == 0.0:
+                        heapq.heappop(self._queue)
+                        self.requests.consume(1)
+                        self.tokens.consume(ticket.tokens)
+                        self._in_flight += 1
+                        self._cond.notify_all()
+                        break
+                else:
+                    wait = None
+
+                if on_queue_position:
+                    position = 1 + sum(1 for t in self._queue if t < ticket)
+                    if position != last_position:
+                        last_position = position
+                        on_queue_position(position)
+
+                if now >= deadline:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                    raise RateLimitQueueTimeout(
+                        f"Request waited more than {self.max_queue_wait:.0f}s for LLM capacity"
+                    )
+                timeout = deadline - now if wait is None else min(wait, deadline - now)
+                self._cond.wait(timeout=max(timeout, 0.01))
+
+        if on_queue_position:
+            on_queue_position(0)
+
+    def _wait_time(self, ticket: _Ticket, now: float) -> Optional[float]:
+        if self._in_flight >= self.max_concurrency:
+            return None  # Woken by _release()
+        return max(
+            self._paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(ticket.tokens, now),
+            0.0,
+        )
+
+    def _release(self, headers=None):
+        with self._cond:
+            self._in_flight -= 1
+            if headers is not None:
+                self._sync_from_headers(headers, time.monotonic())
+            self._cond.notify_all()
+
+    def _on_rate_limited(self, response) -> Optional[float]:
+        """Pause the whole queue until the provider says we may retry."""
+        headers = getattr(response, "headers", None) or {}
+        retry_after = parse_reset_duration(headers.get("retry-after"))
+        with self._cond:
+            now = time.monotonic()
+            self._sync_from_headers(headers, now)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+            self._cond.notify_all()
+        return retry_after
+
+    def _sync_from_headers(self, headers, now: float):
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None:
+            try:
+                self.tokens.sync(
+                    float(remaining_tokens),
+                    parse_reset_duration(headers.get("x-ratelimit-reset-tokens")),
+                    now,
+                    limit=float(headers.get("x-ratelimit-limit-tokens") or 0) or None,
+                )
+            except ValueError:
+                pass
+
+        # Groq reports requests per *day*; only ever tighten the per-minute bucket.
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None:
+            try:
+                self.requests.refill(now)
+                self.requests.tokens = min(self.requests.tokens, float(remaining_requests))
+            except ValueError:
+                pass
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        ceiling = min(self.max_backoff, self.base_backoff * (2 ** (attempt - 1)))
+        return random.uniform(ceiling / 2, ceiling)
@@ -0,0 +1,111 @@
+"""
+Pre-serialized JSON responses.
+
+Dashboard endpoints return the same payload until their data changes, so
+the body is serialized once per (endpoint, parameters, data version) and
+reused as raw bytes. Each body carries a strong ETag (hash of the bytes);
+a request whose If-None-Match matches gets an empty 304.
+
+Large bodies are also gzipped once and cached next to the plain bytes,
+with their own ETag, for clients that accept gzip. Because those responses
+already carry Content-Encoding, GZipMiddleware passes them through untouched.
+
+orjson (in requirements.txt) is used when installed, otherwise the stdlib
+json module with the same compact output FastAPI produces.
+"""
+import gzip
+import hashlib
+import json
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import GZIP_MINIMUM_SIZE
+from app.core.context_cache import LRUCache
+
+try:
+    import orjson
+except ImportError:  # Optional speedup
+    orjson = None
+
+RESPONSE_CACHE_SIZE = 512        # Serialized bodies kept across endpoints/parameters
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ResponseCache:
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.cache = LRUCache(maxsize=maxsize)
+
+    def body(self, key: Hashable, version: Hashable, build: Callable[[], object]) -> Tuple[bytes, str]:
+        """(serialized body, strong ETag) for `key` at data `version`."""
+        def serialize():
+            body = dumps(build())
+            return body, f'"{hashlib.sha1(body).hexdigest()}"'
+        return self.cache.get_or_build((key, version), serialize)
+
+    def gzipped(self, key: Hashable, version: Hashable, body: bytes, etag: str) -> Tuple[bytes, str]:
+        """Gzip variant of a cached body, compressed once; its ETag differs from the plain one."""
+        return self.cache.get_or_build(
+            (key, version, "gzip"), lambda: (gzip.compress(body, compresslevel=6, mtime=0), etag[:-1] + '-gzip"')
+        )
+
+    def respond(
+        self,
+        request: Request,
+        key: Hashable,
+        version: Hashable,
+        build: Callable[[], object],
+        cache_control: str = "no-cache"
+    ) -> Response:
+        body, etag = self.body(key, version, build)
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        accept_encoding = request.headers.get("accept-encoding", "")
+        if len(body) >= GZIP_MINIMUM_SIZE and negotiate_encoding(accept_encoding, ("gzip",)) == "gzip":
+            body, etag = self.gzipped(key, version, body, etag)
+            headers.update({"ETag": etag, "Content-Encoding": "gzip"})
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """
+    Best of `available` (in order of preference) allowed by an Accept-Encoding
+    header, or None for identity. Honors q-values, including q=0 and "*".
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,39 @@
+"""
+Model Routing — picks the model for each LLM request.
+
+Simple questions over a small context go to a fast, cheap model; edits,
+refactors, scaffolds with custom requirements and large contexts go to the
+large model. Routes and their models are configured in app.core.config.
+Each model gets its own rate-limit scheduler, since provider limits are
+per model.
+"""
+from dataclasses import dataclass
+
+from app.core.config import LLM_ROUTING, ROUTE_MODELS, ROUTE_FAST_MAX_CONTEXT_CHARS, ROUTE_FAST_MAX_MESSAGE_CHARS
+from app.core.intents import Intent
+
+
+@dataclass
+class Route:
+    name: str   # "fast" or "large"
+    model: str
+    reason: str
+
+
+class ModelRouter:
+    def route(self, intent: Intent, message: str, context_chars: int = 0, sharded: bool = False) -> Route:
+        """Choose a route from the request kind and the size of its context."""
+        if not LLM_ROUTING:
+            return self._route("large", "routing disabled")
+        if sharded:
+            return self._route("large", "repo-wide sharded edit")
+        if intent.kind != "question":
+            return self._route("large", f"{intent.kind} request")
+        if context_chars > ROUTE_FAST_MAX_CONTEXT_CHARS:
+            return self._route("large", f"context of {context_chars} chars")
+        if len(message) > ROUTE_FAST_MAX_MESSAGE_CHARS:
+            return self._route("large", "long request")
+        return self._route("fast", "simple question")
+
+    def _route(self, name: str, reason: str) -> Route:
+        return Route(name=name, model=ROUTE_MODELS[name], reason=reason)
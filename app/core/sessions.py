@@ -0,0 +1,128 @@
+"""
+Conversation Sessions with compacted history.
+
+Chat turns that carry a session id are remembered server-side so users no
+longer paste earlier answers back in. History is bounded: once the stored
+turns exceed SESSION_HISTORY_TOKENS, the oldest turns are rolled into a
+running summary (by the fast model when available) in the background, so
+prompt size stays flat instead of growing with every turn.
+"""
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional
+
+SESSION_MAX = 1000               # Sessions kept in memory (least recently used evicted)
+SESSION_HISTORY_TOKENS = 2000    # Compact once stored turns exceed this estimate
+SESSION_KEEP_MESSAGES = 4        # Most recent messages always kept verbatim
+MAX_TURN_CHARS = 2000            # Per-message cap when storing a turn
+FALLBACK_SUMMARY_CHARS = 1500    # Summary cap when no LLM summarizer is available
+
+
+def estimate_tokens(messages: List[dict]) -> int:
+    return sum(len(m["content"]) for m in messages) // 4
+
+
+class SessionStore:
+    def __init__(self, summarizer: Optional[Callable[[str, List[dict]], str]] = None):
+        """
+        Args:
+            summarizer: fn(previous_summary, messages) -> new summary. Falls
+                        back to plain truncation when unset or failing.
+        """
+        self.summarizer = summarizer
+        self._sessions: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sessions")
+
+    @staticmethod
+    def new_id() -> str:
+        return f"sess-{uuid.uuid4().hex[:12]}"
+
+    def history(self, session_id: str) -> List[dict]:
+        """Messages to splice into the prompt before the current request."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session:
+                return []
+            self._sessions.move_to_end(session_id)
+            messages = []
+            if session["summary"]:
+                messages.append({
+                    "role": "user",
+                    "content": f"## CONVERSATION SO FAR (summary):\n{session['summary']}"
+                })
+            messages.extend(session["messages"])
+            return messages
+
+    def record(self, session_id: str, user_message: str, assistant_message: str):
+        """Append one turn; schedule compaction if the history grew too large."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = {"id": session_id, "summary": "", "messages": [], "compacting": False}
+                self._sessions[session_id] = session
+                while len(self._sessions) > SESSION_MAX:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            session["messages"].append({"role": "user", "content": user_message[:MAX_TURN_CHARS]})
+            session["messages"].append({"role": "assistant", "content": assistant_message[:MAX_TURN_CHARS]})
+            session["updated_at"] = datetime.now().isoformat()
+
+            needs_compaction = (
+                not session["compacting"]
+                and estimate_tokens(session["messages"]) > SESSION_HISTORY_TOKENS
+                and len(session["messages"]) > SESSION_KEEP_MESSAGES
+            )
+            if needs_compaction:
+                session["compacting"] = True
+        if needs_compaction:
+            self._compactor.submit(self._compact, session_id)
+
+    def info(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session:
+                return None
+            return {
+                "id": session_id,
+                "summary": session["summary"],
+                "messages": len(session["messages"]),
+                "estimated_tokens": estimate_tokens(session["messages"]) + len(session["summary"]) // 4,
+                "updated_at": session.get("updated_at"),
+            }
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def _compact(self, session_id: str):
+        """Fold all but the most recent messages into the running summary."""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if not session:
+                return
+            old = session["messages"][:-SESSION_KEEP_MESSAGES]
+            previous = session["summary"]
+
+        summary = self._summarize(previous, old)
+
+        with self._lock:
+            # Turns recorded meanwhile were appended after `old` — keep them
+            session["messages"] = session["messages"][len(old):]
+            session["summary"] = summary
+            session["compacting"] = False
+
+    def _summarize(self, previous: str, messages: List[dict]) -> str:
+        if self.summarizer:
+            try:
+                return self.summarizer(previous, messages)
+            except Exception as e:
+                print(f"Session summarization failed, truncating instead: {e}")
+        text = previous + "\n" + "\n".join(f"{m['role']}: {m['content'][:200]}" for m in messages)
+        return text.strip()[-FALLBACK_SUMMARY_CHARS:]
+
+
+session_store = SessionStore()
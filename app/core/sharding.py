@@ -0,0 +1,99 @@
+"""
+Map-Reduce Sharding for repo-wide codebase requests.
+
+Requests like "add logging to every route handler" need more files than fit
+in one context window. The relevant files are packed into budget-sized
+shards, each shard is sent to the LLM concurrently, and the per-shard
+results are merged back into one response with conflict detection.
+"""
+import re
+from typing import List, Tuple
+
+from app.models import ChatResponse
+
+# A change verb followed by "every/all/each ... <kind of file or unit>", or an
+# explicit codebase-wide scope. Bare "all"/"every" ("any tests at all?") isn't enough.
+_REPO_WIDE = re.compile(
+    r"\b(?:add|update|rename|replace|remove|delete|convert|migrate|refactor|change|fix|apply|rewrite|"
+    r"wrap|annotate|document|instrument|format|move|upgrade|port)\b.*?"
+    r"(?:\b(?:every|all|each)\s+(?:(?:of\s+)?(?:the|our|my)\s+)?(?:[\w.-]+\s+){0,2}?"
+    r"(?:files?|routes?|handlers?|endpoints?|modules?|functions?|methods?|classes|components?|"
+    r"controllers?|models?|views?|pages?|services?|tests?|scripts?)\b|\beverywhere\b)"
+    r"|\b(?:across|throughout)\s+(?:the\s+)?(?:entire\s+|whole\s+)?(?:codebase|repo|repository|project)\b"
+    r"|\b(?:repo|codebase)-wide\b"
+)
+
+# Only requests that change code are worth fanning out over shards
+REPO_WIDE_KINDS = ("edit", "refactor")
+
+# Per-file overhead of the "### FILE:" block wrapper in the context
+_BLOCK_OVERHEAD = 24
+
+
+def is_repo_wide(query: str, kind: str) -> bool:
+    """Heuristic: is the request (of intent `kind`) a change across the whole codebase?"""
+    return kind in REPO_WIDE_KINDS and bool(_REPO_WIDE.search(query.lower()))
+
+
+def pack_shards(
+    items: List[Tuple[str, str]],
+    budget_chars: int,
+    max_files: int,
+    max_shards: int
+) -> List[List[Tuple[str, str]]]:
+    """
+    Greedily pack (path, content) pairs into shards in the given order.
+
+    Each shard stays within `budget_chars` and `max_files`. Files past
+    `max_shards` full shards are dropped; the caller reports the count.
+    """
+    shards: List[List[Tuple[str, str]]] = []
+    current: List[Tuple[str, str]] = []
+    used = 0
+    for path, content in items:
+        size = len(path) + len(content) + _BLOCK_OVERHEAD
+        if current and (used + size > budget_chars or len(current) >= max_files):
+            shards.append(current)
+            if len(shards) >= max_shards:
+                return shards
+            current, used = [], 0
+        current.append((path, content[:budget_chars - len(path) - _BLOCK_OVERHEAD]))
+        used += size
+    if current:
+        shards.append(current)
+    return shards
+
+
+def merge_shard_results(results: List[ChatResponse]) -> ChatResponse:
+    """
+    Reduce per-shard responses into one.
+
+    When two shards return different content for the same path, the first
+    shard's version wins and the collision is reported as a "conflict"
+    change so the user can review it.
+    """
+    files = {}
+    owner = {}
+    changes = []
+    explanations = []
+
+    for index, result in enumerate(results, start=1):
+        for path, content in result.files.items():
+            if path in files and files[path] != content:
+                changes.append({
+                    "file": path,
+                    "action": "conflict",
+                    "summary": f"Shards {owner[path]} and {index} produced different edits; kept shard {owner[path]}'s version."
+                })
+                continue
+            files.setdefault(path, content)
+            owner.setdefault(path, index)
+        changes.extend(result.changes)
+        if result.explanation:
+            explanations.append(f"[Shard {index}/{len(results)}] {result.explanation}")
+
+    return ChatResponse(
+        files=files,
+        changes=changes,
+        explanation="\n\n".join(explanations)
+    )
@@ -0,0 +1,76 @@
+"""
+Single-Flight Request Coalescing.
+
+When identical LLM requests arrive while one is already in flight, the
+followers wait for the leader's result instead of making their own upstream
+call. Keys are hashes over model + prompt messages + context version, so a
+burst of the same scaffold prompt costs one completion.
+"""
+import hashlib
+import json
+import threading
+from typing import Callable, Optional, Tuple
+
+
+def flight_key(model: str, messages: list, context_version: Optional[str] = None) -> str:
+    """Stable key for a completion request."""
+    payload = json.dumps(
+        {"model": model, "messages": messages, "context_version": context_version or ""},
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-safe coalescing of concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self.coalesced = 0  # Upstream calls saved since start
+
+    def do(self, key: str, fn: Callable) -> Tuple[object, bool]:
+        """
+        Run `fn()` once per key among concurrent callers.
+
+        Returns:
+            (result, shared) — `shared` is True when this caller reused
+            another caller's in-flight result. Exceptions are re-raised in
+            every waiting caller.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
@@ -0,0 +1,167 @@
+"""
+Fingerprinted, Precompressed Frontend Assets.
+
+On first use every file under the frontend directory is read once and:
+
+  - non-HTML assets (CSS, JS, images, ...) get a content-hashed alias,
+    e.g. styles.css → styles.3f2a9c01d4e5.css, served with a one-year
+    immutable Cache-Control — a new build changes the URL, not the cache
+  - HTML pages have their references to those assets rewritten to the
+    fingerprinted names and are served with no-cache + ETag, so a
+    navigation costs a 304 and the CSS/JS come straight from the browser
+    cache
+  - text assets are compressed ahead of time with gzip, and with brotli
+    when the `brotli` package is installed; each request gets the best
+    variant its Accept-Encoding allows
+
+Original (unfingerprinted) names keep working with no-cache revalidation.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.lazy import Lazy
+from app.core.responses import etag_matches, negotiate_encoding
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip only without it
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+FINGERPRINT_LENGTH = 12
+COMPRESS_MIN_SIZE = 256          # Smaller files aren't worth a compressed variant
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# href="..." / src="..." attribute values in HTML
+_REFERENCE = re.compile(r'''(\b(?:href|src)=["'])([^"'#?]+)([^"']*["'])''')
+
+
+class Asset:
+    __slots__ = ("media_type", "variants", "etag")
+
+    def __init__(self, content: bytes, media_type: str):
+        self.media_type = media_type
+        self.etag = hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]
+        self.variants: Dict[Optional[str], bytes] = {None: content}
+        if len(content) >= COMPRESS_MIN_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+            if brotli is not None:
+                self._add_variant("br", brotli.compress(content, quality=11))
+            self._add_variant("gzip", gzip.compress(content, compresslevel=9, mtime=0))
+
+    def _add_variant(self, encoding: str, data: bytes):
+        if len(data) < len(self.variants[None]):
+            self.variants[encoding] = data
+
+    def response(self, request_headers: Dict[str, str], cache_control: str, head: bool = False) -> Response:
+        encoding = negotiate_encoding(
+            request_headers.get("accept-encoding", ""), [e for e in self.variants if e]
+        )
+        etag = f'"{self.etag}-{encoding}"' if encoding else f'"{self.etag}"'
+        headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        if etag_matches(request_headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+        body = self.variants[encoding]
+        if head:
+            headers["Content-Length"] = str(len(body))
+            body = b""
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class AssetBundle:
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.assets: Dict[str, Tuple[Asset, str]] = {}   # Relative path -> (asset, Cache-Control)
+        self.fingerprints: Dict[str, str] = {}   # Relative path -> fingerprinted relative path
+        self._build()
+
+    def _build(self):
+        files = {}
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.directory).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    files[rel] = f.read()
+
+        pages = {rel: content for rel, content in files.items() if rel.endswith((".html", ".htm"))}
+        for rel, content in files.items():
+            if rel in pages:
+                continue
+            asset = Asset(content, _media_type(rel))
+            stem, ext = os.path.splitext(rel)
+            fingerprinted = f"{stem}.{asset.etag}{ext}"
+            self.fingerprints[rel] = fingerprinted
+            self.assets[rel] = (asset, REVALIDATE_CACHE_CONTROL)
+            self.assets[fingerprinted] = (asset, IMMUTABLE_CACHE_CONTROL)
+
+        for rel, content in pages.items():
+            html = self.rewrite(content.decode("utf-8"), rel)
+            self.assets[rel] = (Asset(html.encode("utf-8"), "text/html; charset=utf-8"), REVALIDATE_CACHE_CONTROL)
+
+    def rewrite(self, html: str, page: str) -> str:
+        """Point the page's references to bundled assets at their fingerprinted names."""
+        base = os.path.dirname(page)
+
+        def replace(match):
+            ref = match.group(2)
+            if "://" in ref or ref.startswith("//"):
+                return match.group(0)
+            if ref.startswith("/"):
+                return match.group(0)  # Absolute URLs depend on the mount point; left as-is
+            target = os.path.normpath(os.path.join(base, ref)).replace(os.sep, "/")
+            fingerprinted = self.fingerprints.get(target)
+            if not fingerprinted:
+                return match.group(0)
+            new_ref = ref[:len(ref) - len(os.path.basename(ref))] + os.path.basename(fingerprinted)
+            return f"{match.group(1)}{new_ref}{match.group(3)}"
+        return _REFERENCE.sub(replace, html)
+
+    def get(self, path: str) -> Optional[Tuple[Asset, str]]:
+        path = path.lstrip("/")
+        if not path or path.endswith("/"):
+            path += "index.html"
+        return self.assets.get(path)
+
+
+class StaticAssets:
+    """ASGI app serving an AssetBundle (built on first request or warm-up); mount it like StaticFiles."""
+
+    def __init__(self, directory: str):
+        self._bundle = Lazy(lambda: AssetBundle(directory), name="static_assets")
+
+    @property
+    def bundle(self) -> AssetBundle:
+        return self._bundle.get()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["method"] not in ("GET", "HEAD"):
+            response = PlainTextResponse("Method Not Allowed", status_code=405, headers={"Allow": "GET, HEAD"})
+        else:
+            path, root = scope["path"], scope.get("root_path", "")
+            if root and path.startswith(root):
+                path = path[len(root):]
+            found = self.bundle.get(path)
+            if found is None:
+                response = PlainTextResponse("Not Found", status_code=404)
+            else:
+                asset, cache_control = found
+                headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+                response = asset.response(headers, cache_control, head=scope["method"] == "HEAD")
+        await response(scope, receive, send)
+
+
+def _media_type(path: str) -> str:
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    if media_type.startswith("text/") or media_type == "application/javascript":
+        media_type += "; charset=utf-8"
+    return media_type
@@ -0,0 +1,166 @@
+"""
+File & Directory Summaries for whole-repo awareness.
+
+Files that don't fit in the context window are represented by compact,
+one-line structural summaries (symbols, routes, exports) plus per-directory
+rollups, so the model can reason about the whole repo for a fraction of
+the tokens.
+
+Summaries are extracted statically — no LLM calls — and cached by content
+hash, so after an edit only the changed files are re-summarized. Uploads
+and AI edits warm the cache in the background.
+"""
+import hashlib
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from app.core.context_cache import LRUCache
+
+SUMMARY_CACHE_SIZE = 50000       # File summaries kept (keyed by content hash)
+MAX_SUMMARY_CHARS = 160          # Per-file summary length cap
+MAX_SYMBOLS = 6                  # Symbols listed per file
+MAX_DIRECTORY_LINES = 8          # Directory rollups per context block (the manifest covers the rest)
+
+_SYMBOL_PATTERNS = [
+    # Python
+    re.compile(r"^(?:async\s+)?def\s+([A-Za-z_]\w*)", re.M),
+    re.compile(r"^class\s+([A-Za-z_]\w*)", re.M),
+    # JavaScript / TypeScript
+    re.compile(r"^(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)", re.M),
+    re.compile(r"^(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s*)?(?:\([^)]*\)|[A-Za-z_$][\w$]*)\s*=>", re.M),
+    re.compile(r"^(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)", re.M),
+    # Go
+    re.compile(r"^func\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)", re.M),
+    # Java / C#
+    re.compile(r"^\s*public\s+(?:static\s+)?(?:final\s+)?(?:class|interface|enum|record)\s+([A-Za-z_]\w*)", re.M),
+]
+_ROUTE = re.compile(
+    r"""(?:\b(?:app|router|api|server)\.(get|post|put|patch|delete)\s*\(\s*['"`]([^'"`]+)"""
+    r"""|@\w+\.(get|post|put|patch|delete)\(\s*['"]([^'"]+))""",
+    re.I
+)
+_EXPORTS = re.compile(r"module\.exports\s*=\s*([A-Za-z_$][\w$]*)")
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8", "replace")).hexdigest()
+
+
+def summarize_file(path: str, content: str) -> str:
+    """One-line structural summary of a file."""
+    lines = content.count("\n") + 1
+    parts = []
+
+    routes = list(dict.fromkeys(
+        f"{(m.group(1) or m.group(3)).upper()} {m.group(2) or m.group(4)}" for m in _ROUTE.finditer(content)
+    ))
+    if routes:
+        parts.append("routes " + ", ".join(routes[:MAX_SYMBOLS]))
+
+    symbols = []
+    for pattern in _SYMBOL_PATTERNS:
+        for name in pattern.findall(content):
+            if name not in symbols:
+                symbols.append(name)
+    if symbols:
+        more = f" +{len(symbols) - MAX_SYMBOLS}" if len(symbols) > MAX_SYMBOLS else ""
+        parts.append("defines " + ", ".join(symbols[:MAX_SYMBOLS]) + more)
+
+    exports = _EXPORTS.findall(content)
+    if exports:
+        parts.append("exports " + ", ".join(dict.fromkeys(exports)))
+
+    if not parts:
+        first = next((l.strip() for l in content.splitlines() if l.strip()), "")
+        parts.append(first[:80] if first else "empty")
+
+    summary = f"{lines} lines; " + "; ".join(parts)
+    return summary[:MAX_SUMMARY_CHARS]
+
+
+class SummaryIndex:
+    """Content-hash-keyed file summaries with background warming."""
+
+    def __init__(self):
+        self.cache = LRUCache(maxsize=SUMMARY_CACHE_SIZE)
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summaries")
+
+    def file_summary(self, path: str, content: str) -> str:
+        return self.cache.get_or_build(
+            (os.path.splitext(path)[1], content_hash(content)),
+            lambda: summarize_file(path, content)
+        )
+
+    def warm(self, files: dict):
+        """Summarize every file in the background (only changed content is recomputed)."""
+        snapshot = [(p, info.get("content", "")) for p, info in files.items()]
+        self._pool.submit(self._warm, snapshot)
+
+    def _warm(self, snapshot: List[Tuple[str, str]]):
+        for path, content in snapshot:
+            if not content.startswith("[Binary file"):
+                self.file_summary(path, content)
+
+    def directory_summaries(self, files: dict) -> Dict[str, str]:
+        """{directory: "N files (Lang ×k, ...)"} for every directory."""
+        counts: Dict[str, Counter] = defaultdict(Counter)
+        for path, info in files.items():
+            directory = os.path.dirname(path.replace("\\", "/")) or "."
+            counts[directory][info.get("type", "Other")] += 1
+        return {
+            directory: f"{sum(c.values())} files ({', '.join(f'{lang} ×{n}' for lang, n in c.most_common(3))})"
+            for directory, c in counts.items()
+        }
+
+    def context_block(self, files: dict, excluded: List[str], budget: int) -> Tuple[str, int]:
+        """
+        Summaries for files not shown in full, within `budget` chars.
+
+        `excluded` is expected best first (the relevance ranking); per-file
+        lines are emitted in that order until the budget runs out. When not
+        all fit, up to MAX_DIRECTORY_LINES rollups in the last quarter of the
+        budget cover the directories of the files left over.
+
+        Returns (block, number of files summarized individually).
+        """
+        if budget <= 0 or not excluded:
+            return "", 0
+        header = "### SUMMARIES (files not shown in full, most relevant first):\n"
+        used = len(header)
+
+        paths = [p for p in excluded if not files[p].get("content", "").startswith("[Binary file")]
+        lines = []
+        for path in paths:
+            line = f"  - {path}: {self.file_summary(path, files[path]['content'])}\n"
+            if used + len(line) > budget:
+                break
+            lines.append(line)
+            used += len(line)
+        remaining = paths[len(lines):]
+        summarized = len(lines)
+
+        if remaining:
+            # Not everything fits: hand the last quarter of the budget to directory rollups
+            while lines and used > budget * 3 // 4:
+                used -= len(lines.pop())
+            summarized = len(lines)
+            remaining = paths[summarized:]
+            directories = self.directory_summaries(files)
+            # Directories in the order of their most relevant leftover file
+            for directory in list(dict.fromkeys(
+                os.path.dirname(p.replace("\\", "/")) or "." for p in remaining
+            ))[:MAX_DIRECTORY_LINES]:
+                line = f"  {directory}/ — {directories[directory]}\n"
+                if used + len(line) > budget:
+                    break
+                lines.append(line)
+                used += len(line)
+            lines.append(f"  ... {len(remaining)} more files not summarized (see the manifest)\n")
+
+        return header + "".join(lines) + "\n", summarized
+
+
+summary_index = SummaryIndex()
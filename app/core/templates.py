@@ -1,5 +1,14 @@
+"""
+Service scaffold templates for the zero-LLM fast path.
+
+Templates are `string.Template`s compiled once at import and rendered with
+${service_name} and ${port}. Literal dollar signs (JS template strings,
+Spring placeholders) are escaped as $$.
+"""
+from string import Template
+
 NODE_PACKAGE_JSON = """{
-  "name": "my-service",
+  "name": "${service_name}",
   "version": "1.0.0",
   "main": "index.js",
   "scripts": {
@@ -12,14 +21,20 @@ NODE_PACKAGE_JSON = """{
 
 NODE_INDEX_JS = """const express = require('express');
 const app = express();
-const port = 3000;
+const port = process.env.PORT || ${port};
+
+app.use(express.json());
 
 app.get('/', (req, res) => {
   res.send('Hello System!');
 });
 
+app.get('/health', (req, res) => {
+  res.json({ status: 'ok', service: '${service_name}' });
+});
+
 app.listen(port, () => {
-  console.log(`Example app listening on port ${port}`);
+  console.log(`${service_name} listening on port $${port}`);
 });
 """
 
@@ -29,14 +44,154 @@ uvicorn==0.27.0
 
 PYTHON_MAIN_PY = """from fastapi import FastAPI
 
-app = FastAPI()
+app = FastAPI(title="${service_name}")
 
 @app.get("/")
 def read_root():
     return {"Hello": "System"}
+
+@app.get("/health")
+def health():
+    return {"status": "ok", "service": "${service_name}"}
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=${port})
 """
 
-TEMPLATES = {
+GO_MOD = """module ${service_name}
+
+go 1.22
+"""
+
+GO_MAIN = """package main
+
+import (
+	"encoding/json"
+	"log"
+	"net/http"
+	"os"
+)
+
+func main() {
+	port := os.Getenv("PORT")
+	if port == "" {
+		port = "${port}"
+	}
+
+	mux := http.NewServeMux()
+	mux.HandleFunc("/", func(w http.ResponseWriter, r *http.Request) {
+		w.Write([]byte("Hello System!"))
+	})
+	mux.HandleFunc("/health", func(w http.ResponseWriter, r *http.Request) {
+		w.Header().Set("Content-Type", "application/json")
+		json.NewEncoder(w).Encode(map[string]string{"status": "ok", "service": "${service_name}"})
+	})
+
+	log.Printf("${service_name} listening on port %s", port)
+	log.Fatal(http.ListenAndServe(":"+port, mux))
+}
+"""
+
+JAVA_POM = """<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0"
+         xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"
+         xsi:schemaLocation="http://maven.apache.org/POM/4.0.0 https://maven.apache.org/xsd/maven-4.0.0.xsd">
+    <modelVersion>4.0.0</modelVersion>
+    <parent>
+        <groupId>org.springframework.boot</groupId>
+        <artifactId>spring-boot-starter-parent</artifactId>
+        <version>3.2.2</version>
+    </parent>
+    <groupId>com.example</groupId>
+    <artifactId>${service_name}</artifactId>
+    <version>1.0.0</version>
+    <properties>
+        <java.version>17</java.version>
+    </properties>
+    <dependencies>
+        <dependency>
+            <groupId>org.springframework.boot</groupId>
+            <artifactId>spring-boot-starter-web</artifactId>
+        </dependency>
+    </dependencies>
+    <build>
+        <plugins>
+            <plugin>
+                <groupId>org.springframework.boot</groupId>
+                <artifactId>spring-boot-maven-plugin</artifactId>
+            </plugin>
+        </plugins>
+    </build>
+</project>
+"""
+
+JAVA_APPLICATION = """package com.example.service;
+
+import java.util.Map;
+import org.springframework.boot.SpringApplication;
+import org.springframework.boot.autoconfigure.SpringBootApplication;
+import org.springframework.web.bind.annotation.GetMapping;
+import org.springframework.web.bind.annotation.RestController;
+
+@SpringBootApplication
+@RestController
+public class Application {
+
+    public static void main(String[] args) {
+        SpringApplication.run(Application.class, args);
+    }
+
+    @GetMapping("/")
+    public String root() {
+        return "Hello System!";
+    }
+
+    @GetMapping("/health")
+    public Map<String, String> health() {
+        return Map.of("status", "ok", "service", "${service_name}");
+    }
+}
+"""
+
+JAVA_PROPERTIES = """spring.application.name=${service_name}
+server.port=$${PORT:${port}}
+"""
+
+PYTHON_WORKER_REQUIREMENTS = """celery==5.3.6
+redis==5.0.1
+"""
+
+PYTHON_WORKER_PY = """import os
+from celery import Celery
+
+BROKER_URL = os.getenv("BROKER_URL", "redis://localhost:6379/0")
+
+app = Celery("${service_name}", broker=BROKER_URL, backend=BROKER_URL)
+app.conf.task_acks_late = True
+app.conf.worker_prefetch_multiplier = 1
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=10)
+def process_job(self, payload: dict) -> dict:
+    \"\"\"Process a single job; retried on failure.\"\"\"
+    try:
+        return {"status": "done", "payload": payload}
+    except Exception as exc:
+        raise self.retry(exc=exc)
+"""
+
+PYTHON_WORKER_README = """# ${service_name}
+
+Celery background worker.
+
+    pip install -r requirements.txt
+    celery -A worker worker --loglevel=info
+"""
+
+# Raw template sources per stack: {path: source}
+TEMPLATE_SOURCES = {
     "node": {
         "package.json": NODE_PACKAGE_JSON,
         "index.js": NODE_INDEX_JS
@@ -44,5 +199,34 @@ TEMPLATES = {
     "python": {
         "requirements.txt": PYTHON_REQUIREMENTS,
         "main.py": PYTHON_MAIN_PY
+    },
+    "go": {
+        "go.mod": GO_MOD,
+        "main.go": GO_MAIN
+    },
+    "java": {
+        "pom.xml": JAVA_POM,
+        "src/main/java/com/example/service/Application.java": JAVA_APPLICATION,
+        "src/main/resources/application.properties": JAVA_PROPERTIES
+    },
+    "python-worker": {
+        "requirements.txt": PYTHON_WORKER_REQUIREMENTS,
+        "worker.py": PYTHON_WORKER_PY,
+        "README.md": PYTHON_WORKER_README
     }
 }
+
+# Per-stack defaults and descriptions
+STACK_INFO = {
+    "node": {"port": 3000, "label": "Node.js Express service"},
+    "python": {"port": 8000, "label": "Python FastAPI service"},
+    "go": {"port": 8080, "label": "Go net/http service"},
+    "java": {"port": 8080, "label": "Java Spring Boot service"},
+    "python-worker": {"port": 0, "label": "Python Celery worker"},
+}
+
+# Precompiled at import: {stack: {path: Template}}
+TEMPLATES = {
+    stack: {path: Template(source) for path, source in files.items()}
+    for stack, files in TEMPLATE_SOURCES.items()
+}
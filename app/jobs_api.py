@@ -0,0 +1,139 @@
+"""
+Background Jobs API
+Submit long-running codebase chats, uploads and analyses as jobs, then poll
+or stream their progress over Server-Sent Events.
+"""
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List
+import asyncio
+import json
+
+from app.api import handle_chat
+from app.core.config import JOB_WORKERS, JOB_MAX_QUEUE, JOB_HISTORY_LIMIT, JOBS_PERSISTENCE_FILE
+from app.core.jobs import JobManager, JobQueueFull
+from app.core.lazy import Lazy
+from app.models import ChatRequest
+from app.upload_api import UPLOADED_CODEBASES, ingest_codebase, build_analysis
+
+jobs_router = APIRouter(prefix="/api/jobs", tags=["Background Jobs"])
+
+# Created (and job history loaded) on first use, not at import
+job_manager = Lazy(lambda: JobManager(
+    max_workers=JOB_WORKERS,
+    max_queue=JOB_MAX_QUEUE,
+    history_limit=JOB_HISTORY_LIMIT,
+    persistence_file=JOBS_PERSISTENCE_FILE
+), name="jobs")
+
+SSE_POLL_INTERVAL = 0.5   # Seconds between job state checks
+SSE_HEARTBEAT = 15.0      # Keep-alive comment interval for idle streams
+
+
+def _submit(job_type: str, fn, *args) -> JSONResponse:
+    try:
+        job = job_manager.get().submit(job_type, fn, *args)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return JSONResponse(status_code=202, content=job)
+
+
+# ─── Job Bodies ───────────────────────────────────────────────────
+def _run_chat(report, request: ChatRequest) -> dict:
+    def on_queue_position(position: int):
+        if position:
+            report(5, f"Queued for LLM capacity (position {position})")
+        else:
+            report(10, "Generating response")
+
+    return handle_chat(request, on_queue_position=on_queue_position).model_dump()
+
+
+def _run_ingest(report, project_name: str, description: str, uploads: list) -> dict:
+    return ingest_codebase(project_name, description, uploads, report=report)
+
+
+def _run_analysis(report, codebase_id: str) -> dict:
+    report(10, "Analyzing codebase")
+    return build_analysis(codebase_id)
+
+
+# ─── Submission ───────────────────────────────────────────────────
+@jobs_router.post("/chat", status_code=202)
+async def submit_chat_job(request: ChatRequest):
+    """Queue a chat request (typically codebase-aware) as a background job."""
+    return _submit("chat", _run_chat, request)
+
+
+@jobs_router.post("/upload", status_code=202)
+async def submit_upload_job(
+    project_name: str = Form(...),
+    description: str = Form(""),
+    files: List[UploadFile] = File(...)
+):
+    """Queue ingestion of an uploaded codebase (files or ZIP archives)."""
+    uploads = [(f.filename, await f.read()) for f in files]
+    return _submit("ingest", _run_ingest, project_name, description, uploads)
+
+
+@jobs_router.post("/analyze/{codebase_id}", status_code=202)
+async def submit_analysis_job(codebase_id: str):
+    """Queue analysis of an uploaded codebase."""
+    if codebase_id not in UPLOADED_CODEBASES:
+        raise HTTPException(status_code=404, detail="Codebase not found")
+    return _submit("analysis", _run_analysis, codebase_id)
+
+
+# ─── Status & Results ─────────────────────────────────────────────
+@jobs_router.get("")
+async def list_jobs(limit: int = 50):
+    """Recent jobs (without results) and queue statistics."""
+    manager = job_manager.get()
+    return {"stats": manager.stats(), "jobs": manager.list(limit)}
+
+
+@jobs_router.get("/{job_id}")
+async def get_job(job_id: str):
+    """Current state of a job, including its result once finished."""
+    job = job_manager.get().snapshot(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@jobs_router.get("/{job_id}/events")
+async def stream_job(job_id: str):
+    """Server-Sent Events stream of job progress; ends when the job finishes (or is pruned)."""
+    if not job_manager.get().snapshot(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def events():
+        last_version = None
+        idle = 0.0
+        while True:
+            job = job_manager.get().snapshot(job_id)
+            if job is None:
+                # Pruned from history while we were streaming
+                yield f"event: gone\ndata: {json.dumps({'id': job_id})}\n\n"
+                return
+            if job["version"] != last_version:
+                last_version = job["version"]
+                idle = 0.0
+                finished = job["status"] in ("succeeded", "failed")
+                event = job["status"] if finished else "progress"
+                if not finished:
+                    job.pop("result", None)
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+                if finished:
+                    return
+            elif idle >= SSE_HEARTBEAT:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+            idle += SSE_POLL_INTERVAL
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,53 +2,267 @@
 Mock API endpoints for IDP Platform dashboard.
 Serves data from the in-memory mock database.
 """
-from fastapi import APIRouter, Query
-from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from datetime import timedelta
+from typing import List, Optional, Union
+import threading
+from app.core.broadcast import RESYNC_FRAME, Broadcaster, sse_frame
+from app.core.config import ACTIVITY_STREAM_QUEUE, CATALOG_CACHE_CONTROL
+from app.core.event_log import GRANULARITIES, utc_now
+from app.core.responses import dumps, response_cache
 from app.mock_db import (
-    PLATFORM_STATS, PROJECTS, REPOSITORIES, ACTIVITY_FEED,
-    search_codebase, get_repo_by_name, get_projects_by_status, get_activity_by_type
+    PLATFORM_STATS, EVENT_LOG,
+    search_codebase, get_repo_by_name, get_projects_by_status, data_version,
+    project_fields, known_fields, catalog_count, load_dataset, export_dataset
 )
+from app.models import ActivityEvent, CatalogImport
 
 mock_router = APIRouter(prefix="/api", tags=["Platform Data"])
 
+# New events and stats changes are pushed to /api/activity/stream subscribers
+activity_broadcaster = Broadcaster(queue_size=ACTIVITY_STREAM_QUEUE)
+# Serializes ingestion with its stats snapshots, so each published delta covers exactly one batch
+_ingest_lock = threading.Lock()
+
+SSE_HEARTBEAT = 15.0      # Keep-alive comment interval for idle streams
+
 
 @mock_router.get("/stats")
-async def get_stats():
+def get_stats(request: Request):
     """Get platform-wide statistics for the dashboard."""
-    return PLATFORM_STATS
+    # Derived counters change with new events, the catalog and the (UTC) date
+    version = (EVENT_LOG.get().version(), data_version(), utc_now().date())
+    return response_cache.respond(request, "stats", version, current_stats)
+
+
+@mock_router.get("/stats/timeseries")
+def get_stats_timeseries(
+    event_type: str = Query("deploy", description="Event type to count, e.g. deploy, incident"),
+    granularity: str = Query("day", description="Bucket size: day or hour"),
+    days: int = Query(90, ge=1, le=365, description="How far back to go")
+):
+    """Event counts per day (or hour) from the materialized rollups, zero-filled, oldest first."""
+    if granularity not in ("day", "hour"):
+        raise HTTPException(status_code=400, detail="granularity must be 'day' or 'hour'")
+    if granularity == "hour" and days > 31:
+        raise HTTPException(status_code=400, detail="Hourly series are limited to 31 days")
+
+    step = timedelta(days=1) if granularity == "day" else timedelta(hours=1)
+    width = GRANULARITIES[granularity]
+    now = utc_now()
+    start = now - timedelta(days=days) + step
+    buckets = [(start + i * step).isoformat()[:width] for i in range(int(timedelta(days=days) / step))]
+    counts = EVENT_LOG.get().series(event_type, granularity, since=buckets[0])
+    return {
+        "event_type": event_type.lower(),
+        "granularity": granularity,
+        "points": [{"bucket": b, "count": counts.get(b, 0)} for b in buckets],
+    }
+
+
+def current_stats() -> dict:
+    """PLATFORM_STATS plus catalog totals and the event-driven counters derived from the rollups."""
+    event_log = EVENT_LOG.get()
+    gauges = event_log.gauges()
+    return {
+        **PLATFORM_STATS,
+        "total_services": catalog_count("projects"),
+        "total_repos": catalog_count("repositories"),
+        "deployments_today": event_log.bucket_count("deploy", "day", utc_now().date().isoformat()),
+        "open_incidents": gauges.get("open_incidents", 0),
+        "code_reviews_pending": gauges.get("code_reviews_pending", 0),
+    }
 
 
 @mock_router.get("/projects")
-async def get_projects(status: Optional[str] = Query(None, description="Filter by status: active, staging, maintenance")):
+async def get_projects(
+    request: Request,
+    status: Optional[str] = Query(None, description="Filter by status: active, staging, maintenance"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,name,status")
+):
     """List all projects, optionally filtered by status."""
-    return get_projects_by_status(status or "")
+    selected = _parse_fields(fields, "projects")
+
+    def build():
+        results = get_projects_by_status(status or "")
+        return project_fields("projects", results, selected) if selected else results
+    return response_cache.respond(
+        request, ("projects", status or "", selected), data_version(), build, CATALOG_CACHE_CONTROL
+    )
 
 
 @mock_router.get("/activity")
-async def get_activity(
+def get_activity(
+    response: Response,
     event_type: Optional[str] = Query(None, description="Filter by type: deploy, pr_merged, incident, code_review"),
-    limit: int = Query(20, ge=1, le=50)
+    limit: int = Query(20, ge=1, le=50),
+    since: Optional[str] = Query(None, description="Only events at or after this ISO timestamp"),
+    until: Optional[str] = Query(None, description="Only events before this ISO timestamp"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page")
 ):
-    """Get the recent activity feed."""
-    results = get_activity_by_type(event_type or "")
-    return results[:limit]
+    """
+    Get the activity feed, newest first. When more events match, the
+    cursor for the next page is returned in the X-Next-Cursor header.
+    """
+    try:
+        events, next_cursor = EVENT_LOG.get().page(event_type or "", since or "", until or "", cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return events
+
+
+@mock_router.post("/activity", status_code=201)
+def ingest_activity(events: Union[ActivityEvent, List[ActivityEvent]]):
+    """Append one event or a batch (oldest first). Events with a known id are skipped."""
+    batch = events if isinstance(events, list) else [events]
+    with _ingest_lock:
+        before = current_stats()
+        stored, duplicates = EVENT_LOG.get().append_many(e.model_dump(exclude_none=True) for e in batch)
+        after = current_stats()
+        for event in stored:
+            activity_broadcaster.publish("activity", event, event["id"])
+        delta = {k: after[k] - before[k] for k in after if after[k] != before[k]}
+        if delta:
+            activity_broadcaster.publish("stats", {"delta": delta, "stats": after})
+
+    return {"accepted": len(stored), "duplicates": duplicates, "events": stored}
+
+
+@mock_router.get("/activity/stream")
+async def stream_activity(last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events: `activity` for each new event, `stats` with the
+    changed counters, and `resync` when this client fell too far behind
+    (refetch over REST). Starts with a `stats` snapshot.
+
+    Frames carry the latest event id; a reconnecting client's Last-Event-ID
+    gets the events it missed replayed, or a `resync` if they can't be.
+    """
+    async def events():
+        subscription = activity_broadcaster.subscribe()
+        try:
+            # Subscribed first, so nothing published from here on is missed; the
+            # log queries block on SQLite, so they run off the event loop
+            event_log = await run_in_threadpool(EVENT_LOG.get)
+            missed = []
+            if last_event_id:
+                missed = await run_in_threadpool(event_log.appended_after, last_event_id, ACTIVITY_STREAM_QUEUE)
+            replayed = {event["id"] for event in missed or ()}
+            snapshot_id, stats = await run_in_threadpool(_stats_snapshot, event_log)
+            yield sse_frame("stats", {"delta": {}, "stats": stats}, None if missed else snapshot_id)
+            if missed is None:
+                yield RESYNC_FRAME
+            for event in missed or ():
+                yield sse_frame("activity", event, event["id"])
+            while True:
+                frame = await subscription.next(SSE_HEARTBEAT)
+                if frame is None:
+                    yield ": keep-alive\n\n"
+                elif not (replayed and _frame_id(frame) in replayed):
+                    yield frame
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 
 
 @mock_router.get("/codebase")
-async def get_codebase(q: Optional[str] = Query(None, description="Search by name, language, or description")):
+async def get_codebase(
+    request: Request,
+    q: Optional[str] = Query(None, description="Search by name, language, or description"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,language")
+):
     """List codebase repositories, optionally filtered by search query."""
-    results = search_codebase(q or "")
-    # Strip sample_files from list view for brevity
-    return [
-        {k: v for k, v in repo.items() if k != "sample_files"}
-        for repo in results
-    ]
+    # Strip sample_files from list view for brevity unless explicitly requested
+    selected = _parse_fields(fields, "repositories") or _list_repo_fields()
+
+    def build():
+        return project_fields("repositories", search_codebase(q or ""), selected)
+    return response_cache.respond(
+        request, ("codebase", q or "", selected), data_version(), build, CATALOG_CACHE_CONTROL
+    )
 
 
 @mock_router.get("/codebase/{repo_name}")
-async def get_repo_detail(repo_name: str):
+async def get_repo_detail(
+    request: Request,
+    repo_name: str,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+):
     """Get full details for a single repository, including sample files."""
-    repo = get_repo_by_name(repo_name)
-    if not repo:
+    selected = _parse_fields(fields, "repositories")
+
+    # The repo is looked up only on a cache miss; unknown names aren't cached
+    def build():
+        repo = get_repo_by_name(repo_name)
+        if not repo:
+            raise _RepoNotFound(repo_name)
+        return project_fields("repositories", [repo], selected)[0] if selected else repo
+    try:
+        return response_cache.respond(
+            request, ("repo", repo_name, selected), data_version(), build, CATALOG_CACHE_CONTROL
+        )
+    except _RepoNotFound:
         return {"error": f"Repository '{repo_name}' not found"}
-    return repo
+
+
+@mock_router.get("/catalog/export")
+def export_catalog():
+    """All projects and repositories, in the format POST /api/catalog/import accepts."""
+    return Response(
+        content=dumps(export_dataset()),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="catalog.json"'}
+    )
+
+
+@mock_router.post("/catalog/import")
+def import_catalog(catalog: CatalogImport):
+    """Replace all projects and repositories in one step."""
+    try:
+        load_dataset(catalog.projects, catalog.repositories)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"projects": len(catalog.projects), "repositories": len(catalog.repositories)}
+
+
+class _RepoNotFound(Exception):
+    pass
+
+
+def _stats_snapshot(event_log) -> tuple:
+    """(latest event id, current stats), taken between ingests so the two agree."""
+    with _ingest_lock:
+        return event_log.last_id(), current_stats()
+
+
+def _frame_id(frame: str) -> Optional[str]:
+    return frame[4:frame.index("\n")] if frame.startswith("id: ") else None
+
+
+def _list_repo_fields() -> tuple:
+    return tuple(f for f in known_fields("repositories") if f != "sample_files")
+
+
+def _parse_fields(fields: Optional[str], kind: str) -> Optional[tuple]:
+    """Validate `fields=` into a canonical tuple (record order) so equal sets share a cache entry."""
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    known = known_fields(kind)
+    unknown = requested - set(known)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(known)}"
+        )
+    return tuple(f for f in known if f in requested) or None
@@ -1,20 +1,23 @@
 """
 Mock Database for IDP Platform
-In-memory sample data to demonstrate platform capabilities.
+Sample data to demonstrate platform capabilities, served through the
+configured catalog store and the activity event log.
 """
 from datetime import datetime, timedelta
 import random
 
+from app.core.catalog_store import open_store
+from app.core.config import DATA_BACKEND, DATA_FILE, EVENT_LOG_FILE, EVENT_LOG_MAX_EVENTS
+from app.core.event_log import EventLog
+from app.core.lazy import Lazy
+
 # ─── Platform Stats ───────────────────────────────────────────────
+# Static figures only: service/repo totals come from the catalog store and
+# deployments, incidents and reviews from the event log (see /api/stats)
 PLATFORM_STATS = {
-    "total_services": 47,
     "active_developers": 128,
     "uptime_percent": 99.97,
-    "deployments_today": 23,
-    "total_repos": 156,
-    "open_incidents": 2,
     "avg_build_time_sec": 142,
-    "code_reviews_pending": 8
 }
 
 # ─── Projects ─────────────────────────────────────────────────────
@@ -473,35 +476,56 @@ ACTIVITY_FEED = [
 ]
 
 
+# ─── Storage ──────────────────────────────────────────────────────
+# Projects and repositories are served from the IDP_DATA_BACKEND store
+# ("memory" or "sqlite"), seeded with the sample data above when empty.
+# Activity lives in the append-only SQLite event log, seeded with ACTIVITY_FEED.
+# Both are opened on first use, not at import.
+STORE = Lazy(lambda: open_store(DATA_BACKEND, DATA_FILE, PROJECTS, REPOSITORIES), name="catalog_store")
+EVENT_LOG = Lazy(
+    lambda: EventLog(EVENT_LOG_FILE, max_events=EVENT_LOG_MAX_EVENTS, seed=ACTIVITY_FEED), name="event_log"
+)
+
+
+def load_dataset(projects: list, repositories: list):
+    """Bulk-replace the catalog (e.g. with synthetic or exported data)."""
+    STORE.get().import_records(projects, repositories)
+
+
+def export_dataset() -> dict:
+    """{"projects": [...], "repositories": [...]} — the input format of load_dataset."""
+    return STORE.get().export()
+
+
+def data_version():
+    """Changes whenever projects or repositories change; keys cached responses."""
+    return STORE.get().version()
+
+
 # ─── Search Helpers ───────────────────────────────────────────────
 def search_codebase(query: str = ""):
     """Search repos by name, language, or description."""
-    if not query:
-        return REPOSITORIES
-    q = query.lower()
-    return [
-        r for r in REPOSITORIES
-        if q in r["name"].lower()
-        or q in r["language"].lower()
-        or q in r["description"].lower()
-        or q in r.get("framework", "").lower()
-    ]
+    return STORE.get().search_repositories(query)
 
 def get_repo_by_name(name: str):
     """Get a single repo by name."""
-    for r in REPOSITORIES:
-        if r["name"] == name:
-            return r
-    return None
+    return STORE.get().repository(name)
 
 def get_projects_by_status(status: str = ""):
     """Filter projects by status."""
-    if not status:
-        return PROJECTS
-    return [p for p in PROJECTS if p["status"] == status.lower()]
-
-def get_activity_by_type(event_type: str = ""):
-    """Filter activity by event type."""
-    if not event_type:
-        return ACTIVITY_FEED
-    return [a for a in ACTIVITY_FEED if a["type"] == event_type.lower()]
+    return STORE.get().projects(status)
+
+def get_activity_by_type(event_type: str = "", limit: int = 50):
+    """Most recent activity, optionally filtered by event type."""
+    return EVENT_LOG.get().page(event_type, limit=limit)[0]
+
+def project_fields(kind: str, records: list, fields: tuple) -> list:
+    """Sparse fieldset of `records` ("projects" or "repositories")."""
+    return STORE.get().project(kind, records, fields)
+
+def catalog_count(kind: str) -> int:
+    """Number of projects or repositories in the catalog."""
+    return STORE.get().count(kind)
+
+def known_fields(kind: str) -> tuple:
+    return STORE.get().fields(kind)
@@ -1,10 +1,14 @@
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, field_validator
 from typing import Dict, List, Optional
 
 
 class ChatRequest(BaseModel):
     message: str
     codebase_id: Optional[str] = None
+    edit_mode: Optional[str] = None  # "patch" or "full" (codebase chats only)
+    sharded: Optional[bool] = None   # Map-reduce over many files; None = auto-detect
+    session_id: Optional[str] = None # Multi-turn conversation; "new" starts one
 
 
 class ChatResponse(BaseModel):
@@ -12,3 +16,29 @@ class ChatResponse(BaseModel):
     files: Dict[str, str] = {}
     explanation: str = ""
     changes: List[dict] = []
+    model: str = ""  # Model that produced the answer ("" for template responses)
+    session_id: Optional[str] = None
+
+
+class ActivityEvent(BaseModel):
+    type: str                        # deploy, pr_merged, incident, code_review, ...
+    title: str
+    description: str = ""
+    author: str = ""
+    project: str = ""
+    status: str = ""
+    timestamp: Optional[str] = None  # ISO 8601, UTC unless it has an offset; defaults to ingestion time
+    id: Optional[str] = None         # Client id makes ingestion idempotent
+    item_id: Optional[str] = None    # Incident / review this event updates (e.g. "INC-42")
+
+    @field_validator("timestamp")
+    @classmethod
+    def _iso_timestamp(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            datetime.fromisoformat(value)  # ValueError → 422
+        return value
+
+
+class CatalogImport(BaseModel):
+    projects: List[dict]             # Each needs "id" and "status"
+    repositories: List[dict]         # Each needs "name"
@@ -5,16 +5,22 @@ and provides AI-powered code analysis and generation based on uploaded code.
 """
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import StreamingResponse
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import os
 import io
 import zipfile
 import json
+import threading
+from collections import UserDict
 from datetime import datetime
+from app.core.config import INGEST_FILTER
+from app.core.ingest_filter import IngestFilter, IngestReport, gitignores_in
+from app.core.lazy import Lazy
+from app.core.summaries import summary_index
 
 upload_router = APIRouter(prefix="/api/upload", tags=["Codebase Upload"])
 
-# In-memory storage (initialized from disk)
+# In-memory storage (initialized from disk on first use)
 PERSISTENCE_FILE = "codebases.json"
 
 def load_codebases():
@@ -26,14 +32,83 @@ def load_codebases():
             print(f"Error loading codebases: {e}")
     return {}
 
+# Chat edits, uploads and jobs update codebases from worker threads:
+#   - _ids_lock makes id allocation and insertion one step
+#   - codebase_lock(id) serializes updates to one codebase's record
+#   - a record's "files" dict is never mutated in place; updates swap in a
+#     new dict, so readers (the LLM context, saves, downloads) iterate a
+#     stable snapshot
+_ids_lock = threading.Lock()
+_save_lock = threading.Lock()
+_codebase_locks: Dict[str, threading.Lock] = {}
+
+
+def codebase_lock(codebase_id: str) -> threading.Lock:
+    with _ids_lock:
+        return _codebase_locks.setdefault(codebase_id, threading.Lock())
+
+
 def save_codebases():
-    try:
-        with open(PERSISTENCE_FILE, "w", encoding="utf-8") as f:
-            json.dump(UPLOADED_CODEBASES, f, indent=2)
-    except Exception as e:
-        print(f"Error saving codebases: {e}")
+    with _save_lock:
+        # Copy the records so concurrent updates can't resize a dict mid-dump
+        snapshot = {cb_id: dict(cb) for cb_id, cb in list(UPLOADED_CODEBASES.data.items())}
+        try:
+            temp_file = PERSISTENCE_FILE + ".tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=2)
+            os.replace(temp_file, PERSISTENCE_FILE)
+        except Exception as e:
+            print(f"Error saving codebases: {e}")
+
+
+def update_codebase_files(codebase_id: str, base_files: dict, contents: Dict[str, str],
+                          detect_type: Callable[[str], str]) -> List[str]:
+    """
+    Store AI-edited file contents in a codebase, as a new version.
+
+    `base_files` is the files snapshot the edit was computed from. A file
+    that another request changed since then is not overwritten; its path is
+    returned as a conflict instead.
+    """
+    with codebase_lock(codebase_id):
+        cb = UPLOADED_CODEBASES.get(codebase_id)
+        if cb is None:
+            return sorted(contents)
+        files = dict(cb["files"])
+        conflicts = []
+        for path, content in contents.items():
+            if files.get(path) is not base_files.get(path):
+                conflicts.append(path)
+                continue
+            files[path] = {
+                "content": content,
+                "size": len(content.encode("utf-8")),
+                "type": detect_type(path)
+            }
+        if len(conflicts) < len(contents):
+            cb["files"] = files
+            cb["status"] = "modified"
+            cb["version"] = cb.get("version", 0) + 1
+    if len(conflicts) < len(contents):
+        save_codebases()
+        summary_index.warm(files)
+    return conflicts
+
+class LazyCodebases(UserDict):
+    """Dict of uploaded codebases that reads PERSISTENCE_FILE on first access, not at import."""
+
+    def __init__(self):
+        self._lazy = Lazy(load_codebases, name="codebases")
 
-UPLOADED_CODEBASES = load_codebases()
+    @property
+    def data(self) -> dict:
+        return self._lazy.get()
+
+    @property
+    def ready(self) -> bool:
+        return self._lazy.ready
+
+UPLOADED_CODEBASES = LazyCodebases()
 
 
 
@@ -47,76 +122,107 @@ async def upload_codebase(
     Upload a codebase (multiple files) for AI training/analysis.
     Files are stored in-memory and can be used for context-aware AI responses.
     """
+    uploads = [(f.filename, await f.read()) for f in files]
+    return ingest_codebase(project_name, description, uploads)
+
+
+def ingest_codebase(
+    project_name: str,
+    description: str,
+    uploads: List[Tuple[str, bytes]],
+    report: Optional[Callable[[int, str], None]] = None
+) -> dict:
+    """
+    Decode uploaded files (expanding ZIP archives), store them as a new
+    codebase and persist. Shared by the direct upload endpoint and the
+    background ingestion job, which passes `report` for progress.
+    """
     uploaded_files = {}
     total_size = 0
     languages = set()
+    ingest = IngestReport()
+    regular_filter = IngestFilter()
+    if INGEST_FILTER:
+        regular_filter.add_project_roots([path for path, _ in uploads])
+        for path, text in gitignores_in(uploads):
+            regular_filter.add_gitignore(path, text)
+
+    def keep(path: str, data: bytes, ingest_filter: IngestFilter, binary_placeholder: bool) -> bool:
+        """Decode and store one file unless it is filtered out; returns whether it was kept."""
+        nonlocal total_size
+        try:
+            text = data.decode("utf-8")
+        except UnicodeDecodeError:
+            if not binary_placeholder:
+                return False
+            text = f"[Binary file - {len(data)} bytes]"
+        else:
+            reason = ingest_filter.classify_content(path, text) if INGEST_FILTER and text else None
+            if reason:
+                ingest.skip(path, len(data), reason)
+                return False
+        uploaded_files[path] = {
+            "content": text,
+            "size": len(data),
+            "type": _detect_language(path)
+        }
+        total_size += len(data)
+        languages.add(_detect_language(path))
+        return True
+
+    for index, (filename, content) in enumerate(uploads):
+        if report:
+            report(int(90 * index / len(uploads)), f"Processing {filename}")
 
-    for f in files:
         # Check if it's a ZIP file
-        if f.filename.lower().endswith('.zip'):
-            content = await f.read()
+        if filename.lower().endswith('.zip'):
             try:
                 with zipfile.ZipFile(io.BytesIO(content)) as z:
-                    for zip_info in z.infolist():
-                        if zip_info.is_dir():
+                    members = [info for info in z.infolist() if not info.is_dir()]
+                    zip_filter = IngestFilter()
+                    if INGEST_FILTER:
+                        zip_filter.add_project_roots([m.filename for m in members])
+                        gitignores = [(m.filename, z.read(m)) for m in members if m.filename.endswith(".gitignore")]
+                        for path, text in gitignores_in(gitignores):
+                            zip_filter.add_gitignore(path, text)
+
+                    for zip_info in members:
+                        # Vendored / generated paths are skipped without decompressing
+                        reason = zip_filter.classify_path(zip_info.filename) if INGEST_FILTER else None
+                        if reason:
+                            ingest.skip(zip_info.filename, zip_info.file_size, reason)
                             continue
-                        
-                        # Read file from zip
-                        with z.open(zip_info) as zf:
-                            file_content = zf.read()
-                            
-                            # Skip binary / large files inside zip
-                            try:
-                                text = file_content.decode("utf-8")
-                                uploaded_files[zip_info.filename] = {
-                                    "content": text,
-                                    "size": len(file_content),
-                                    "type": _detect_language(zip_info.filename)
-                                }
-                                total_size += len(file_content)
-                                languages.add(_detect_language(zip_info.filename))
-                            except UnicodeDecodeError:
-                                # Skip binary files inside zip
-                                pass
+                        # Binary files inside zips are skipped
+                        keep(zip_info.filename, z.read(zip_info), zip_filter, binary_placeholder=False)
             except zipfile.BadZipFile:
                 pass
             continue
 
         # Regular file upload
-        content = await f.read()
-        try:
-            text = content.decode("utf-8")
-            uploaded_files[f.filename] = {
-                "content": text,
-                "size": len(content),
-                "type": _detect_language(f.filename)
-            }
-        except UnicodeDecodeError:
-            uploaded_files[f.filename] = {
-                "content": f"[Binary file - {len(content)} bytes]",
-                "size": len(content),
-                "type": _detect_language(f.filename)
-            }
-        
-        total_size += len(content)
-        languages.add(_detect_language(f.filename))
-
-    codebase_id = f"cb-{len(UPLOADED_CODEBASES) + 1:03d}"
-
+        reason = regular_filter.classify_path(filename) if INGEST_FILTER else None
+        if reason:
+            ingest.skip(filename, len(content), reason)
+            continue
+        keep(filename, content, regular_filter, binary_placeholder=True)
+
+    with _ids_lock:
+        codebase_id = _next_codebase_id()
+        UPLOADED_CODEBASES[codebase_id] = {
+            "id": codebase_id,
+            "project_name": project_name,
+            "description": description,
+            "files": uploaded_files,
+            "file_count": len(uploaded_files),
+            "total_size": total_size,
+            "languages": list(languages),
+            "uploaded_at": datetime.now().isoformat(),
+            "status": "ready",
+            "ingest_report": ingest.summary(),
+            "skipped_files": ingest.skipped
+        }
 
-    UPLOADED_CODEBASES[codebase_id] = {
-        "id": codebase_id,
-        "project_name": project_name,
-        "description": description,
-        "files": uploaded_files,
-        "file_count": len(uploaded_files),
-        "total_size": total_size,
-        "languages": list(languages),
-        "uploaded_at": datetime.now().isoformat(),
-        "status": "ready"
-    }
-    
     save_codebases()
+    summary_index.warm(uploaded_files)
 
     return {
         "success": True,
@@ -125,10 +231,21 @@ async def upload_codebase(
         "file_count": len(uploaded_files),
         "total_size_kb": round(total_size / 1024, 1),
         "languages": list(languages),
-        "message": f"Codebase '{project_name}' uploaded successfully! {len(uploaded_files)} files indexed."
+        "ingest_report": ingest.summary(),
+        "message": (
+            f"Codebase '{project_name}' uploaded successfully! {len(uploaded_files)} files indexed"
+            + (f", {ingest.skipped_count} skipped ({round(ingest.bytes_saved / 1024, 1)} KB saved)."
+               if ingest.skipped_count else ".")
+        )
     }
 
 
+def _next_codebase_id() -> str:
+    """One past the highest cb-NNN in use (call with _ids_lock held)."""
+    numbers = [int(cb_id[3:]) for cb_id in UPLOADED_CODEBASES if cb_id.startswith("cb-") and cb_id[3:].isdigit()]
+    return f"cb-{max(numbers, default=0) + 1:03d}"
+
+
 @upload_router.get("/codebases")
 async def list_uploaded_codebases():
     """List all uploaded codebases."""
@@ -163,6 +280,7 @@ async def get_codebase_detail(codebase_id: str):
         "languages": cb["languages"],
         "uploaded_at": cb["uploaded_at"],
         "status": cb["status"],
+        "ingest_report": cb.get("ingest_report"),
         "files": {
             name: {"size": info["size"], "type": info["type"]}
             for name, info in cb["files"].items()
@@ -194,8 +312,11 @@ async def delete_codebase(codebase_id: str):
     if codebase_id not in UPLOADED_CODEBASES:
         raise HTTPException(status_code=404, detail="Codebase not found")
 
-    name = UPLOADED_CODEBASES[codebase_id]["project_name"]
-    del UPLOADED_CODEBASES[codebase_id]
+    with codebase_lock(codebase_id):
+        cb = UPLOADED_CODEBASES.pop(codebase_id, None)
+    if cb is None:
+        raise HTTPException(status_code=404, detail="Codebase not found")
+    name = cb["project_name"]
     save_codebases()
     return {"success": True, "message": f"Codebase '{name}' deleted."}
 
@@ -209,6 +330,11 @@ async def analyze_codebase(codebase_id: str):
     if codebase_id not in UPLOADED_CODEBASES:
         raise HTTPException(status_code=404, detail="Codebase not found")
 
+    return build_analysis(codebase_id)
+
+
+def build_analysis(codebase_id: str) -> dict:
+    """Compute the codebase analysis (also run as a background job)."""
     cb = UPLOADED_CODEBASES[codebase_id]
     files = cb["files"]
 
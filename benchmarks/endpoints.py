@@ -0,0 +1,191 @@
+"""
+Dashboard endpoint benchmarks on synthetic data.
+
+Loads a seeded synthetic catalog and event log (see benchmarks.synthetic_data)
+into the app, then for every /api/* dashboard endpoint measures:
+
+  - cold latency: first request, response cache emptied
+  - warm latency: p50/p95/p99 over repeated requests
+  - revalidation latency: If-None-Match → 304 (cached endpoints only)
+  - response size and tracemalloc peak of the cold request
+
+plus startup cost (subprocess `import main`, dataset load and index build)
+and process RSS.
+
+Usage:
+    python -m benchmarks.endpoints                       # --scale 0.1 (5k repos, 500k events)
+    python -m benchmarks.endpoints --scale 1             # full 50k repos / 10k projects / 5M events
+    python -m benchmarks.endpoints --data bench_data     # reuse `python -m benchmarks.synthetic_data` output
+    python -m benchmarks.endpoints --backend sqlite      # catalog in SQLite (IDP_DATA_BACKEND)
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks import synthetic_data  # noqa: E402
+from benchmarks.loadgen import percentile  # noqa: E402
+
+
+def prepare_data(args) -> str:
+    """Directory with catalog.json and events.db, generated unless --data is given."""
+    if args.data:
+        return os.path.abspath(args.data)
+    out = tempfile.mkdtemp(prefix="idp-bench-data-")
+    started = time.perf_counter()
+    projects, repositories = synthetic_data.generate_catalog(args.scale, args.seed)
+    with open(os.path.join(out, "catalog.json"), "w", encoding="utf-8") as f:
+        json.dump({"projects": projects, "repositories": repositories}, f)
+    count = synthetic_data.write_event_log(
+        os.path.join(out, "events.db"), synthetic_data.generate_events(projects, args.scale, args.seed)
+    )
+    print(f"Generated {len(repositories)} repos, {len(projects)} projects, {count} events "
+          f"in {time.perf_counter() - started:.1f}s → {out}")
+    return out
+
+
+def import_time(env: dict) -> float:
+    """Seconds for a fresh interpreter to import the app (median of 3)."""
+    timings = []
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-c", "import time; t = time.perf_counter(); import main; "
+                                   "print(time.perf_counter() - t)"],
+            cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return sorted(timings)[1]
+
+
+def rss_mb() -> float:
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def endpoint_cases(repositories: List[dict]) -> List[Tuple[str, str]]:
+    repo = repositories[len(repositories) // 2]["name"]
+    return [
+        ("stats", "/api/stats"),
+        ("timeseries day", "/api/stats/timeseries?event_type=deploy&days=90"),
+        ("timeseries hour", "/api/stats/timeseries?event_type=deploy&granularity=hour&days=7"),
+        ("projects", "/api/projects"),
+        ("projects status", "/api/projects?status=staging"),
+        ("projects fields", "/api/projects?fields=id,name,status"),
+        ("activity", "/api/activity"),
+        ("activity type", "/api/activity?event_type=incident&limit=50"),
+        ("activity page 2", "/api/activity?cursor={cursor}"),
+        ("codebase", "/api/codebase"),
+        ("codebase q", "/api/codebase?q=payment"),
+        ("codebase fields", "/api/codebase?fields=name,language"),
+        ("repo detail", f"/api/codebase/{repo}"),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=0.1, help="Synthetic data scale (1 = 50k repos, 5M events)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", help="Existing synthetic_data output directory")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory", help="Catalog store")
+    parser.add_argument("--requests", type=int, default=50, help="Warm requests per endpoint")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    data_dir = prepare_data(args)
+    os.environ["EVENT_LOG_FILE"] = os.path.join(data_dir, "events.db")
+    os.environ["IDP_DATA_BACKEND"] = args.backend
+    os.environ["IDP_DATA_FILE"] = os.path.join(data_dir, "catalog.db")
+    os.environ.setdefault("GROK_API_KEY", "benchmark")
+    results = {"startup": {"import_s": round(import_time(dict(os.environ)), 3)}}
+
+    # Uploads and jobs persist relative to the working directory — keep them out of the repo
+    os.chdir(tempfile.mkdtemp(prefix="idp-bench-"))
+    started = time.perf_counter()
+    import main as app_main
+    from fastapi.testclient import TestClient
+    from app import mock_db
+    from app.core import responses
+    from app.core.context_cache import LRUCache
+    results["startup"]["import_inprocess_s"] = round(time.perf_counter() - started, 3)
+
+    with open(os.path.join(data_dir, "catalog.json"), "r", encoding="utf-8") as f:
+        catalog = json.load(f)
+    started = time.perf_counter()
+    mock_db.load_dataset(catalog["projects"], catalog["repositories"])
+    results["startup"]["load_dataset_s"] = round(time.perf_counter() - started, 3)
+    del catalog
+    results["startup"]["rss_mb"] = round(rss_mb(), 1)
+
+    client = TestClient(app_main.app)
+    cursor = client.get("/api/activity").headers.get("x-next-cursor", "")
+
+    results["endpoints"] = {}
+    for name, path in endpoint_cases(mock_db.search_codebase()):
+        path = path.format(cursor=cursor)
+        responses.response_cache.cache = LRUCache(maxsize=responses.RESPONSE_CACHE_SIZE)
+        tracemalloc.start()
+        start = time.perf_counter()
+        response = client.get(path)
+        cold = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        response.raise_for_status()
+
+        warm = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            client.get(path)
+            warm.append(time.perf_counter() - start)
+
+        revalidate = None
+        etag = response.headers.get("etag")
+        if etag:
+            samples = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                client.get(path, headers={"If-None-Match": etag})
+                samples.append(time.perf_counter() - start)
+            revalidate = round(percentile(sorted(samples), 50) * 1000, 2)
+
+        warm.sort()
+        results["endpoints"][name] = {
+            "path": path,
+            "cold_ms": round(cold * 1000, 2),
+            "p50_ms": round(percentile(warm, 50) * 1000, 2),
+            "p95_ms": round(percentile(warm, 95) * 1000, 2),
+            "p99_ms": round(percentile(warm, 99) * 1000, 2),
+            "304_p50_ms": revalidate,
+            "bytes": len(response.content),
+            "cold_peak_kb": round(peak / 1024, 1),
+        }
+    results["startup"]["rss_after_mb"] = round(rss_mb(), 1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    startup = results["startup"]
+    print(f"\nBackend: {args.backend}")
+    print(f"Startup: import main {startup['import_s'] * 1000:.0f}ms (fresh interpreter), "
+          f"load_dataset {startup['load_dataset_s'] * 1000:.0f}ms, "
+          f"RSS {startup['rss_mb']}MB → {startup['rss_after_mb']}MB after requests\n")
+    print(f"{'endpoint':<18}{'cold':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'304':>9}{'bytes':>11}{'peak KB':>10}")
+    for name, r in results["endpoints"].items():
+        revalidate = f"{r['304_p50_ms']:.2f}" if r["304_p50_ms"] is not None else "-"
+        print(f"{name:<18}{r['cold_ms']:>9.2f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+              f"{revalidate:>9}{r['bytes']:>11}{r['cold_peak_kb']:>10}")
+    print("\n(times in ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Fake OpenAI-compatible LLM server for load testing.
+
+Serves /v1/chat/completions with configurable latency, token generation
+rate, injected 429s (random, an RPM and/or a TPM limit) and canned JSON
+outputs shaped like what each of our prompts expects, so the platform can
+be load tested without burning provider quota.
+
+Every response carries x-ratelimit-*-tokens headers for the --tpm budget,
+which the platform's scheduler adopts as its tokens/min capacity. The
+request bucket is only ever tightened by headers, so raise the platform's
+LLM_REQUESTS_PER_MINUTE to match --rpm (or to something large when --rpm
+is 0).
+
+Usage:
+    python -m benchmarks.fake_llm --port 9000 --latency 0.3 --tokens-per-second 400 --error-rate 0.05
+    GROK_BASE_URL=http://localhost:9000/v1 GROK_API_KEY=fake LLM_REQUESTS_PER_MINUTE=6000 python main.py
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+
+@dataclass
+class FakeSettings:
+    latency: float = 0.2              # Seconds before the first token
+    jitter: float = 0.05              # Uniform ± jitter on latency
+    tokens_per_second: float = 500.0  # Generation rate; 0 disables
+    error_rate: float = 0.0           # Probability of an injected 429
+    requests_per_minute: int = 0      # Sliding-window limit; 0 disables
+    tokens_per_minute: int = 1_000_000  # Sliding-window token budget advertised (and enforced)
+    retry_after: float = 1.0          # Retry-After sent with 429s
+    responses: Dict[str, dict] = field(default_factory=dict)  # Overrides by kind
+
+
+CANNED = {
+    "service": {
+        "folder_structure": "service/\n├── package.json\n└── index.js",
+        "files": {
+            "package.json": "{\n  \"name\": \"service\",\n  \"main\": \"index.js\"\n}",
+            "index.js": "const express = require('express');\nconst app = express();\napp.listen(3000);\n"
+        },
+        "explanation": "Fake LLM: a minimal Express service."
+    },
+    "codebase": {
+        "files": {"NOTES.md": "# Notes\n\nGenerated by the fake LLM server.\n"},
+        "changes": [{"file": "NOTES.md", "action": "created", "summary": "Load-test placeholder"}],
+        "explanation": "Fake LLM: added a notes file."
+    },
+    "patch": {
+        "edits": [],
+        "files": {"NOTES.md": "# Notes\n\nGenerated by the fake LLM server.\n"},
+        "changes": [{"file": "NOTES.md", "action": "created", "summary": "Load-test placeholder"}],
+        "explanation": "Fake LLM: added a notes file."
+    },
+    "summary": {"summary": "Fake LLM: the user and assistant discussed the project."},
+}
+
+settings = FakeSettings()
+app = FastAPI(title="Fake LLM")
+
+_lock = threading.Lock()
+_window: deque = deque()         # Request timestamps in the last minute
+_token_window: deque = deque()   # (timestamp, tokens) charged in the last minute
+_stats = {"requests": 0, "completed": 0, "rate_limited": 0}
+
+
+def _kind(messages: list) -> str:
+    """Pick a canned output from the system prompt the platform sent."""
+    system = messages[0].get("content", "") if messages else ""
+    if "running summary" in system:
+        return "summary"
+    if "search/replace edits" in system:
+        return "patch"
+    if "real codebase" in system:
+        return "codebase"
+    return "service"
+
+
+def _token_headers(now: float) -> dict:
+    """x-ratelimit-*-tokens for the current window; call with `_lock` held."""
+    while _token_window and now - _token_window[0][0] > 60:
+        _token_window.popleft()
+    used = sum(tokens for _, tokens in _token_window)
+    reset = 60 - (now - _token_window[0][0]) if _token_window else 0.0
+    return {
+        "x-ratelimit-limit-tokens": str(settings.tokens_per_minute),
+        "x-ratelimit-remaining-tokens": str(max(0, settings.tokens_per_minute - used)),
+        "x-ratelimit-reset-tokens": f"{reset:.2f}s",
+    }
+
+
+def _rate_limited(tokens: int) -> Optional[dict]:
+    """Headers for a 429 when this request should be rejected, else None."""
+    now = time.monotonic()
+    with _lock:
+        _stats["requests"] += 1
+        limited = random.random() < settings.error_rate
+        if settings.requests_per_minute:
+            while _window and now - _window[0] > 60:
+                _window.popleft()
+            if len(_window) >= settings.requests_per_minute:
+                limited = True
+        token_headers = _token_headers(now)
+        if int(token_headers["x-ratelimit-remaining-tokens"]) < tokens:
+            _stats["rate_limited"] += 1
+            return {"retry-after": token_headers["x-ratelimit-reset-tokens"].rstrip("s"), **token_headers}
+        if limited:
+            _stats["rate_limited"] += 1
+            return {
+                "retry-after": f"{settings.retry_after:g}",
+                "x-ratelimit-remaining-requests": "0",
+                "x-ratelimit-reset-requests": f"{settings.retry_after:g}s",
+                **token_headers,
+            }
+        if settings.requests_per_minute:
+            _window.append(now)
+        _token_window.append((now, tokens))
+    return None
+
+
+def _success_headers() -> dict:
+    now = time.monotonic()
+    with _lock:
+        if settings.requests_per_minute:
+            limit, remaining = settings.requests_per_minute, settings.requests_per_minute - len(_window)
+        else:
+            limit, remaining = 14400, 14000
+        return {
+            "x-ratelimit-limit-requests": str(limit),
+            "x-ratelimit-remaining-requests": str(max(0, remaining)),
+            "x-ratelimit-reset-requests": "6s",
+            **_token_headers(now),
+        }
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    kind = _kind(messages)
+    content = json.dumps(settings.responses.get(kind, CANNED[kind]))
+    prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+    completion_tokens = max(1, len(content) // 4)
+
+    limited = _rate_limited(prompt_tokens + completion_tokens)
+    if limited:
+        return JSONResponse(
+            status_code=429,
+            headers=limited,
+            content={"error": {
+                "message": "Rate limit reached (injected by fake LLM)",
+                "type": "rate_limit_exceeded",
+                "code": "rate_limit_exceeded"
+            }}
+        )
+
+    delay = max(0.0, settings.latency + random.uniform(-settings.jitter, settings.jitter))
+    if settings.tokens_per_second:
+        delay += completion_tokens / settings.tokens_per_second
+    await asyncio.sleep(delay)
+
+    with _lock:
+        _stats["completed"] += 1
+    return JSONResponse(
+        headers=_success_headers(),
+        content={
+            "id": f"chatcmpl-{uuid.uuid4().hex[:24]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        }
+    )
+
+
+@app.get("/v1/models")
+async def list_models():
+    return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "fake-llm"}]}
+
+
+@app.get("/stats")
+async def stats():
+    with _lock:
+        return dict(_stats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=settings.latency)
+    parser.add_argument("--jitter", type=float, default=settings.jitter)
+    parser.add_argument("--tokens-per-second", type=float, default=settings.tokens_per_second)
+    parser.add_argument("--error-rate", type=float, default=settings.error_rate, help="Probability of a 429")
+    parser.add_argument("--rpm", type=int, default=0, help="Requests per minute before 429s (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=settings.tokens_per_minute, help="Tokens per minute before 429s")
+    parser.add_argument("--retry-after", type=float, default=settings.retry_after)
+    parser.add_argument("--responses", help="JSON file of canned outputs keyed by service/codebase/patch/summary")
+    args = parser.parse_args()
+
+    settings.latency = args.latency
+    settings.jitter = args.jitter
+    settings.tokens_per_second = args.tokens_per_second
+    settings.error_rate = args.error_rate
+    settings.requests_per_minute = args.rpm
+    if args.tpm <= 0:
+        parser.error("--tpm must be positive")
+    settings.tokens_per_minute = args.tpm
+    settings.retry_after = args.retry_after
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            settings.responses = json.load(f)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
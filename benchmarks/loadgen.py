@@ -0,0 +1,146 @@
+"""
+Load generator for the chat endpoints.
+
+Fires requests at /api/chat with a fixed number of concurrent workers and
+reports latency percentiles (p50/p95/p99), throughput and errors for the
+standard and the codebase-aware scenario. Point the platform at the fake
+LLM server (benchmarks/fake_llm.py) to measure our own overhead; start the
+platform with LLM_REQUESTS_PER_MINUTE raised to the fake server's --rpm so
+the client-side limiter doesn't become the bottleneck.
+
+Usage:
+    python -m benchmarks.loadgen --scenario both --concurrency 16 --requests 200
+    python -m benchmarks.loadgen --scenario codebase --codebase-id cb-001 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from typing import List, Optional
+
+import httpx
+
+DEFAULT_MESSAGE = "Explain the trade-offs of retry queues versus circuit breakers for our payments API"
+DEFAULT_CODEBASE_MESSAGE = "Add request logging middleware to the server"
+MOCK_ZIP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mock_nodejs_project.zip")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+async def upload_mock_codebase(client: httpx.AsyncClient) -> str:
+    with open(MOCK_ZIP, "rb") as f:
+        response = await client.post(
+            "/api/upload/codebase",
+            data={"project_name": "loadgen", "description": "Load generator fixture"},
+            files={"files": ("mock_nodejs_project.zip", f.read(), "application/zip")},
+        )
+    response.raise_for_status()
+    return response.json()["codebase_id"]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    name: str,
+    payload: dict,
+    requests: int,
+    concurrency: int,
+    identical: bool = False
+) -> dict:
+    """
+    Run `requests` chats over `concurrency` workers. Messages are made
+    unique per request unless `identical`, which exercises coalescing.
+    """
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for index in remaining:
+            body = payload if identical else {**payload, "message": f"{payload['message']} (request {index})"}
+            start = time.perf_counter()
+            try:
+                response = await client.post("/api/chat", json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        "statuses": dict(statuses),
+    }
+
+
+def print_report(result: dict):
+    print(f"\n── {result['scenario']} ({result['requests']} requests, concurrency {result['concurrency']})")
+    print(f"   throughput  {result['rps']} req/s over {result['elapsed_s']}s")
+    print(f"   latency     p50 {result['p50_ms']}ms   p95 {result['p95_ms']}ms   "
+          f"p99 {result['p99_ms']}ms   max {result['max_ms']}ms")
+    print(f"   statuses    {result['statuses']}")
+
+
+async def main_async(args) -> List[dict]:
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=timeout, limits=limits) as client:
+        results = []
+        if args.scenario in ("standard", "both"):
+            results.append(await run_scenario(
+                client, "standard", {"message": args.message or DEFAULT_MESSAGE},
+                args.requests, args.concurrency, args.identical
+            ))
+        if args.scenario in ("codebase", "both"):
+            codebase_id: Optional[str] = args.codebase_id or await upload_mock_codebase(client)
+            results.append(await run_scenario(
+                client, "codebase",
+                {"message": args.message or DEFAULT_CODEBASE_MESSAGE, "codebase_id": codebase_id},
+                args.requests, args.concurrency, args.identical
+            ))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--scenario", choices=["standard", "codebase", "both"], default="both")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--message", help="Chat message to send (defaults per scenario)")
+    parser.add_argument("--codebase-id", help="Existing codebase to use; uploads the mock project otherwise")
+    parser.add_argument("--identical", action="store_true", help="Send the same message every time (tests coalescing)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_report(result)
+
+
+if __name__ == "__main__":
+    main()
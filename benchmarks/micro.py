@@ -0,0 +1,177 @@
+"""
+Micro-benchmarks for the codebase hot paths.
+
+Times context building, relevance scoring, ZIP ingestion, file-tree
+rendering and codebase persistence on synthetic codebases (see
+generate_mock_zip.synthetic_files), records peak memory with tracemalloc,
+and compares both against a stored baseline. Exits non-zero when any
+benchmark regresses beyond the threshold.
+
+Usage:
+    python -m benchmarks.micro                       # 1k and 10k files vs baseline
+    python -m benchmarks.micro --sizes 1000,100000
+    python -m benchmarks.micro --update-baseline     # record new numbers
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+QUERY = "add rate limiting to the billing payment routes"
+
+sys.path.insert(0, REPO_ROOT)
+# Benchmarks never call the provider, but LLMService refuses to start without a key
+os.environ.setdefault("GROK_API_KEY", "benchmark")
+# Ingestion persists codebases.json relative to the working directory — keep it out of the repo
+os.chdir(tempfile.mkdtemp(prefix="idp-bench-"))
+
+from generate_mock_zip import synthetic_files, synthetic_zip  # noqa: E402
+from app import upload_api  # noqa: E402
+from app.core.llm import LLMService  # noqa: E402
+from app.core.summaries import summary_index  # noqa: E402
+
+
+def _codebase(files: Dict[str, str]) -> dict:
+    return {
+        path: {"content": content, "size": len(content), "type": upload_api._detect_language(path)}
+        for path, content in files.items()
+    }
+
+
+def _drain_background_work():
+    """Let ingestion's summary warming finish so it doesn't skew the next benchmark."""
+    summary_index._pool.submit(lambda: None).result()
+
+
+def build_benchmarks(size: int) -> List[Tuple[str, Callable[[], object]]]:
+    """(name, fn) pairs for one synthetic codebase size."""
+    raw = synthetic_files(size)
+    files = _codebase(raw)
+    archive = synthetic_zip(size)
+    service = LLMService()
+    query_words = set(QUERY.split())
+
+    def relevance_score():
+        for path, info in files.items():
+            service._relevance_score(path, info["content"], QUERY, query_words)
+
+    def build_smart_context():
+        # No context_version, so nothing is served from the context cache
+        service._build_smart_context(QUERY, files)
+
+    def ingest_zip():
+        result = upload_api.ingest_codebase("bench", "", [("synthetic.zip", archive)])
+        del upload_api.UPLOADED_CODEBASES[result["codebase_id"]]
+
+    def file_tree():
+        upload_api._build_file_tree(list(files))
+
+    def save_codebases():
+        upload_api.save_codebases()
+
+    def with_saved_codebase(fn):
+        def run():
+            upload_api.UPLOADED_CODEBASES["cb-bench"] = {"id": "cb-bench", "files": files}
+            try:
+                fn()
+            finally:
+                upload_api.UPLOADED_CODEBASES.pop("cb-bench", None)
+        return run
+
+    return [
+        ("relevance_score", relevance_score),
+        ("build_smart_context", build_smart_context),
+        ("ingest_zip", ingest_zip),
+        ("file_tree", file_tree),
+        ("save_codebases", with_saved_codebase(save_codebases)),
+    ]
+
+
+def measure(fn: Callable[[], object], repeat: int) -> dict:
+    """Median wall time over `repeat` runs, then peak traced memory of one more run."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+        _drain_background_work()
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    _drain_background_work()
+
+    return {"time_ms": round(statistics.median(timings) * 1000, 2), "peak_kb": round(peak / 1024, 1)}
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float, memory_threshold: float) -> List[str]:
+    """Describe every metric that regressed beyond its threshold."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if result["time_ms"] > base["time_ms"] * (1 + threshold):
+            regressions.append(f"{key}: time {base['time_ms']}ms → {result['time_ms']}ms")
+        if result["peak_kb"] > base["peak_kb"] * (1 + memory_threshold):
+            regressions.append(f"{key}: peak memory {base['peak_kb']}KB → {result['peak_kb']}KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated file counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="Run only benchmarks whose name contains this")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed time regression (0.25 = +25%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10, help="Allowed peak memory regression")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    print(f"{'benchmark':<32}{'time (ms)':>12}{'peak (KB)':>14}{'vs baseline':>14}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        for name, fn in build_benchmarks(size):
+            if args.only and args.only not in name:
+                continue
+            key = f"{name}@{size}"
+            results[key] = measure(fn, args.repeat)
+            base = baseline.get(key)
+            delta = f"{(results[key]['time_ms'] / base['time_ms'] - 1) * 100:+.0f}%" if base else "new"
+            print(f"{key:<32}{results[key]['time_ms']:>12}{results[key]['peak_kb']:>14}{delta:>14}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline updated: {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
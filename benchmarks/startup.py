@@ -0,0 +1,176 @@
+"""
+Startup-time benchmark.
+
+Tracks what worker boot and test collection pay before the first request:
+
+  - `import main` wall time and RSS in a fresh interpreter (median of --runs)
+  - the heaviest top-level packages by self import time (-X importtime)
+  - whether the LLM SDK (openai) is still imported eagerly
+  - uvicorn boot: time until /health answers and until /ready reports
+    every lazily-initialized service built
+
+Each run uses a scratch working directory, so the repo's codebases.json,
+jobs.json and SQLite files are neither read nor written. Results are
+compared against benchmarks/startup_baseline.json.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --update-baseline
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(REPO_ROOT, "benchmarks", "startup_baseline.json")
+EAGER_IMPORTS_TO_AVOID = ("openai", "dotenv")
+
+_IMPORT_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    "import_ms": elapsed * 1000,
+    "rss_mb": rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    # Startup must not need a real key; the LLM client isn't built at import anyway
+    env.setdefault("GROK_API_KEY", "benchmark")
+    return env
+
+
+def measure_import(runs: int) -> dict:
+    """Median import time/RSS of `import main`, and which modules it pulled in."""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SCRIPT],
+            cwd=tempfile.mkdtemp(prefix="idp-startup-"), env=_env(), capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    modules = set(samples[-1]["modules"])
+    return {
+        "import_ms": round(statistics.median(s["import_ms"] for s in samples), 1),
+        "rss_mb": round(statistics.median(s["rss_mb"] for s in samples), 1),
+        "eager": [name for name in EAGER_IMPORTS_TO_AVOID if name in modules],
+    }
+
+
+def heaviest_packages(top: int) -> List[Tuple[str, float]]:
+    """Top-level packages by summed self import time (ms) from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=tempfile.mkdtemp(prefix="idp-startup-"), env=_env(), capture_output=True, text=True, check=True
+    )
+    totals = Counter()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        totals[name.split(".")[0]] += int(self_us) / 1000
+    return [(name, round(ms, 1)) for name, ms in totals.most_common(top)]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(url: str, deadline: float) -> bool:
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    return False
+
+
+def measure_boot(timeout: float) -> Dict[str, float]:
+    """ms from spawning uvicorn until /health and /ready return 200."""
+    port = _free_port()
+    start = time.monotonic()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=tempfile.mkdtemp(prefix="idp-startup-"), env=_env()
+    )
+    try:
+        deadline = start + timeout
+        if not _wait_for(f"http://127.0.0.1:{port}/health", deadline):
+            raise RuntimeError("Server did not become live in time")
+        live = time.monotonic() - start
+        if not _wait_for(f"http://127.0.0.1:{port}/ready", deadline):
+            raise RuntimeError("Server did not become ready in time")
+        ready = time.monotonic() - start
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return {"live_ms": round(live * 1000, 1), "ready_ms": round(ready * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh-interpreter imports to take the median of")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest packages to list")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for the server")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression (0.25 = +25%%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = measure_import(args.runs)
+    results.update(measure_boot(args.timeout))
+
+    print(f"import main      {results['import_ms']:>8} ms   (RSS {results['rss_mb']} MB)")
+    print(f"uvicorn live     {results['live_ms']:>8} ms   (/health)")
+    print(f"uvicorn ready    {results['ready_ms']:>8} ms   (/ready)")
+    print(f"eager imports    {', '.join(results['eager']) or 'none'}")
+    print("\nHeaviest packages by self import time:")
+    for name, ms in heaviest_packages(args.top):
+        print(f"  {name:<28}{ms:>8} ms")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({k: results[k] for k in ("import_ms", "rss_mb", "live_ms", "ready_ms")}, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline updated: {args.baseline}")
+        return
+
+    regressions = [f"eager import of {name}" for name in results["eager"]]
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for key, base in baseline.items():
+            if results[key] > base * (1 + args.threshold):
+                regressions.append(f"{key}: {base} → {results[key]}")
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
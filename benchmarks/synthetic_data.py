@@ -0,0 +1,157 @@
+"""
+Seeded synthetic platform data.
+
+Generates projects, repositories and activity events shaped like the
+records in app/mock_db.py, at production-like volume (50k repos, 10k
+projects, 5M events at --scale 1). The same seed always produces the same
+data, so benchmark runs are comparable.
+
+Usage:
+    python -m benchmarks.synthetic_data --scale 0.1 --out bench_data
+    # writes bench_data/catalog.json (projects + repositories) and bench_data/events.db
+"""
+import argparse
+import json
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+
+REPOS = 50_000
+PROJECTS = 10_000
+EVENTS = 5_000_000
+EVENT_DAYS = 90                  # Events are spread over this many days up to now
+EVENT_BATCH = 10_000             # Events per event-log transaction
+
+LANGUAGES = [
+    ("Python", ["FastAPI", "Django", "Flask"]), ("JavaScript", ["Express", "Next.js"]),
+    ("TypeScript", ["NestJS", "React"]), ("Go", ["Gin", "Echo"]), ("Java", ["Spring Boot"]),
+    ("Rust", ["Axum", "Actix"]), ("HCL", ["Terraform"]),
+]
+DOMAINS = ["payment", "auth", "billing", "search", "notification", "inventory", "analytics", "gateway",
+           "checkout", "identity", "ledger", "catalog", "shipping", "pricing", "fraud", "reporting"]
+KINDS = ["svc", "api", "worker", "pipe", "lib", "ui", "infra", "tool"]
+STATUSES = ["active"] * 6 + ["staging"] * 2 + ["maintenance"]
+HEALTH = ["healthy"] * 8 + ["degraded", "warning"]
+PEOPLE = ["Arjun Mehta", "Priya Sharma", "Rahul Verma", "Sneha Iyer", "Vikram Nair", "Ananya Rao",
+          "Karan Singh", "Meera Pillai", "Rohan Das", "Divya Menon"]
+EVENT_TYPES = ["deploy"] * 4 + ["pr_merged"] * 3 + ["code_review"] * 2 + ["incident"]
+EVENT_STATUSES = {
+    "deploy": ["success"] * 9 + ["failed"],
+    "pr_merged": ["success"],
+    "code_review": ["pending", "approved"],
+    "incident": ["investigating", "resolved"],
+}
+
+
+def _timestamp(rng: random.Random, now: datetime, days: int = EVENT_DAYS) -> str:
+    return (now - timedelta(seconds=rng.randint(0, days * 86400))).isoformat(timespec="seconds")
+
+
+def generate_catalog(scale: float = 1.0, seed: int = 0) -> Tuple[List[dict], List[dict]]:
+    """(projects, repositories) with `scale` × the default volume."""
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    repositories = []
+    for i in range(max(1, int(REPOS * scale))):
+        language, frameworks = rng.choice(LANGUAGES)
+        domain, kind = rng.choice(DOMAINS), rng.choice(KINDS)
+        name = f"{domain}-{kind}-{i}"
+        repositories.append({
+            "name": name,
+            "language": language,
+            "framework": rng.choice(frameworks),
+            "lines_of_code": rng.randint(500, 250_000),
+            "contributors": rng.randint(1, 40),
+            "open_prs": rng.randint(0, 25),
+            "last_commit": _timestamp(rng, now, 365),
+            "branch_count": rng.randint(1, 60),
+            "test_coverage": round(rng.uniform(20, 98), 1),
+            "description": f"{domain.title()} {kind} owned by the {domain} team",
+            "sample_files": {"README.md": f"# {name}\n\n{domain.title()} {kind}.\n"},
+        })
+
+    projects = []
+    for i in range(max(1, int(PROJECTS * scale))):
+        repo = repositories[i % len(repositories)]
+        projects.append({
+            "id": f"proj-{i + 1:06d}",
+            "name": f"{repo['name'].replace('-', ' ').title()}",
+            "description": repo["description"],
+            "tech_stack": [repo["language"], repo["framework"]],
+            "status": rng.choice(STATUSES),
+            "team_lead": rng.choice(PEOPLE),
+            "team_size": rng.randint(2, 15),
+            "last_deploy": _timestamp(rng, now, 120),
+            "deploy_count": rng.randint(0, 2000),
+            "health": rng.choice(HEALTH),
+            "repo": repo["name"],
+        })
+    return projects, repositories
+
+
+def generate_events(projects: List[dict], scale: float = 1.0, seed: int = 0) -> Iterator[dict]:
+    """Activity events in ascending time order (the event log's append order)."""
+    rng = random.Random(seed + 1)
+    count = max(1, int(EVENTS * scale))
+    start = datetime.now() - timedelta(days=EVENT_DAYS)
+    step = EVENT_DAYS * 86400 / count
+    for i in range(count):
+        kind = rng.choice(EVENT_TYPES)
+        project = projects[rng.randrange(len(projects))]
+        yield {
+            "id": f"syn-{i:08d}",
+            "type": kind,
+            "title": f"{kind.replace('_', ' ').title()} on {project['repo']}",
+            "description": f"Synthetic {kind} event #{i}",
+            "author": rng.choice(PEOPLE),
+            "timestamp": (start + timedelta(seconds=i * step)).isoformat(timespec="seconds"),
+            "project": project["name"],
+            "status": rng.choice(EVENT_STATUSES[kind]),
+        }
+
+
+def write_event_log(path: str, events: Iterator[dict]) -> int:
+    """Bulk-append events into a fresh event log at `path`; returns the count."""
+    from app.core.event_log import EventLog
+
+    log = EventLog(path, max_events=10 ** 9)
+    total, batch = 0, []
+    for event in events:
+        batch.append(event)
+        if len(batch) >= EVENT_BATCH:
+            total += len(log.append_many(batch)[0])
+            batch = []
+    if batch:
+        total += len(log.append_many(batch)[0])
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier on 50k repos / 10k projects / 5M events")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_data", help="Output directory")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    started = time.perf_counter()
+    projects, repositories = generate_catalog(args.scale, args.seed)
+    with open(os.path.join(args.out, "catalog.json"), "w", encoding="utf-8") as f:
+        json.dump({"projects": projects, "repositories": repositories}, f)
+    print(f"catalog: {len(projects)} projects, {len(repositories)} repositories "
+          f"({time.perf_counter() - started:.1f}s)")
+
+    started = time.perf_counter()
+    events_path = os.path.join(args.out, "events.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(events_path + suffix):
+            os.remove(events_path + suffix)
+    count = write_event_log(events_path, generate_events(projects, args.scale, args.seed))
+    print(f"events:  {count} → {events_path} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
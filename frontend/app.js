@@ -44,9 +44,31 @@ const api = {
     },
     getCodebase: (query) => api.get(`/api/codebase${query ? `?q=${encodeURIComponent(query)}` : ''}`),
     getRepo: (name) => api.get(`/api/codebase/${name}`),
-    chat: (message) => api.post('/chat', { message })
+    chat: (message) => api.post('/api/chat', { message })
 };
 
+// ─── Live Updates (Server-Sent Events) ────────────────────────
+// Pushes new activity events and dashboard stat changes. EventSource
+// reconnects on its own and the server replays what was missed (by
+// Last-Event-ID); `resync` means it couldn't and this tab should refetch
+// over REST. A stream closed for good is reopened, with a refetch too.
+function subscribeActivity(handlers = {}) {
+    if (!window.EventSource) return null;
+    const { onActivity, onStats, onResync } = handlers;
+    const source = new EventSource(`${API_BASE}/api/activity/stream`);
+    if (onActivity) source.addEventListener('activity', e => onActivity(JSON.parse(e.data)));
+    if (onStats) source.addEventListener('stats', e => onStats(JSON.parse(e.data)));
+    if (onResync) source.addEventListener('resync', () => onResync());
+    source.addEventListener('error', () => {
+        if (source.readyState !== EventSource.CLOSED) return;
+        setTimeout(() => {
+            subscribeActivity(handlers);
+            if (onResync) onResync();
+        }, 5000);
+    });
+    return source;
+}
+
 // ─── Utility Functions ─────────────────────────────────────────
 function timeAgo(dateStr) {
     const now = new Date();
@@ -1,6 +1,8 @@
 import zipfile
 import os
 import io
+import random
+import sys
 
 def create_mock_project():
     # Define virtual file system
@@ -73,5 +75,66 @@ It contains a simple Express server with a mock auth route.
     print(f"\n✅ {zip_filename} created successfully!")
     print(f"Location: {os.path.abspath(zip_filename)}")
 
+# ─── Synthetic codebases for benchmarks ───────────────────────────
+SYNTHETIC_SERVICES = ["auth", "billing", "orders", "users", "search", "notifications", "inventory", "gateway"]
+SYNTHETIC_LAYERS = ["routes", "controllers", "services", "models", "utils", "middleware", "tests"]
+SYNTHETIC_WORDS = ["user", "order", "invoice", "token", "cache", "session", "payment", "report", "queue", "event"]
+
+
+def _synthetic_source(rng, ext, name):
+    """A small, plausible source file with functions and the odd route."""
+    lines = []
+    for i in range(rng.randint(2, 6)):
+        word = rng.choice(SYNTHETIC_WORDS)
+        if ext == ".py":
+            if i == 0 and rng.random() < 0.3:
+                lines.append(f"@router.get('/{name}/{word}')")
+            lines.append(f"def {word}_{name}_{i}(request):")
+            lines.extend(f"    value_{j} = request.get('{word}_{j}')" for j in range(rng.randint(2, 8)))
+            lines.append(f"    return {{'{word}': value_0}}\n")
+        elif ext == ".go":
+            lines.append(f"func {word.title()}{name.title()}{i}(ctx context.Context) error {{")
+            lines.extend(f"\t{word}{j} := ctx.Value(\"{word}_{j}\")" for j in range(rng.randint(2, 8)))
+            lines.append("\treturn nil\n}\n")
+        else:
+            if i == 0 and rng.random() < 0.3:
+                lines.append(f"router.get('/{name}/{word}', {word}Handler{i});")
+            lines.append(f"export function {word}{name.title()}{i}(req, res) {{")
+            lines.extend(f"  const {word}{j} = req.body.{word}{j};" for j in range(rng.randint(2, 8)))
+            lines.append(f"  return res.json({{ {word}: {word}0 }});\n}}\n")
+    return "\n".join(lines)
+
+
+def synthetic_files(n_files, seed=0):
+    """Deterministic {path: content} codebase with `n_files` files spread over services and layers."""
+    rng = random.Random(seed)
+    files = {}
+    for index in range(n_files):
+        service = SYNTHETIC_SERVICES[index % len(SYNTHETIC_SERVICES)]
+        layer = rng.choice(SYNTHETIC_LAYERS)
+        ext = rng.choice([".js", ".ts", ".py", ".go"])
+        name = f"{rng.choice(SYNTHETIC_WORDS)}{index}"
+        bucket = f"part{index // 500}"
+        files[f"services/{service}/src/{layer}/{bucket}/{name}{ext}"] = _synthetic_source(rng, ext, name)
+    return files
+
+
+def synthetic_zip(n_files, seed=0):
+    """ZIP archive bytes of `synthetic_files(n_files, seed)`."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for filename, content in synthetic_files(n_files, seed).items():
+            zf.writestr(filename, content)
+    return buffer.getvalue()
+
+
 if __name__ == "__main__":
-    create_mock_project()
+    # `python generate_mock_zip.py 10000` writes synthetic_10000.zip instead of the mock project
+    if len(sys.argv) > 1:
+        count = int(sys.argv[1])
+        zip_filename = f"synthetic_{count}.zip"
+        with open(zip_filename, "wb") as f:
+            f.write(synthetic_zip(count))
+        print(f"✅ {zip_filename} created with {count} files")
+    else:
+        create_mock_project()
@@ -1,14 +1,31 @@
+from contextlib import asynccontextmanager
+import threading
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from app.api import router
 from app.mock_api import mock_router
 from app.upload_api import upload_router
+from app.jobs_api import jobs_router
+from app.core.config import GZIP_MINIMUM_SIZE, STATIC_ASSET_BUNDLE
+from app.core.lazy import readiness, warm_up
+from app.core.static_assets import StaticAssets
 import os
 from pathlib import Path
 
-app = FastAPI(title="IDP Platform - AI-Powered Internal Developer Platform")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Services are built lazily; warm them in the background so the server
+    # accepts connections (and /health answers) right away. /ready turns
+    # 200 once everything is built.
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="IDP Platform - AI-Powered Internal Developer Platform", lifespan=lifespan)
 
 # CORS for frontend
 app.add_middleware(
@@ -17,18 +34,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+# Compress large JSON; skips text/event-stream and already-encoded (precompressed) responses
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
 
 # API routes
 app.include_router(router)
 app.include_router(mock_router)
 app.include_router(upload_router)
+app.include_router(jobs_router)
 
 # Mount frontend static files — use absolute path
 BASE_DIR = Path(__file__).resolve().parent
 frontend_dir = BASE_DIR / "frontend"
 if frontend_dir.exists():
-    app.mount("/static", StaticFiles(directory=str(frontend_dir), html=True), name="static")
+    if STATIC_ASSET_BUNDLE:
+        # Fingerprinted + precompressed, built once per process (restart to pick up edits)
+        app.mount("/static", StaticAssets(directory=str(frontend_dir)), name="static")
+    else:
+        app.mount("/static", StaticFiles(directory=str(frontend_dir), html=True), name="static")
 
 @app.get("/")
 def read_root():
@@ -36,6 +61,23 @@ def read_root():
     return RedirectResponse(url="/static/index.html")
 
 
+@app.get("/health")
+async def health():
+    """Liveness: the process is up. Never waits on (or builds) any service."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: 200 once every lazily-initialized service is built, else 503."""
+    components = readiness()
+    is_ready = all(components.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "starting", "components": components}
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,7 @@
 import requests
 import json
 
-url = "http://localhost:8000/chat"
+url = "http://localhost:8000/api/chat"
 payload = {"message": "Create a Node.js service"}
 headers = {"Content-Type": "application/json"}
 
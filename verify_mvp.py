@@ -6,7 +6,7 @@ client = TestClient(app)
 
 def test_chat(message: str, expected_snippet: str):
     print(f"\n--- Testing: '{message}' ---")
-    response = client.post("/chat", json={"message": message})
+    response = client.post("/api/chat", json={"message": message})
     if response.status_code != 200:
         print(f"FAILED: Status code {response.status_code}")
         print(response.text)